@@ -0,0 +1,140 @@
+"""Adaptive micro-batching for per-item endpoints
+
+Concurrent single-item requests are collected for up to ``max_latency_ms`` or
+``max_batch_size`` items, the service's batch function runs once, and each
+awaiting request receives its own result.
+"""
+
+import asyncio
+import logging
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from .metrics import register_metrics_source
+
+logger = logging.getLogger(__name__)
+
+# Upper bounds of the realized batch size histogram buckets
+BATCH_SIZE_BUCKETS = (1, 2, 4, 8, 16, 32, 64, 128, 256)
+
+
+class MicroBatcher:
+    """Coalesce concurrent single-item calls into one batch call
+
+    ``batch_fn`` receives a list of items and must return a list of results in
+    the same order. The collection window adapts to traffic: when a window
+    closes on timeout with a single item the next window is halved (so idle
+    traffic is not delayed), and when a batch fills up the window grows back
+    towards ``max_latency_ms``.
+    """
+
+    def __init__(self, name: str, batch_fn: Callable[[List[Any]], List[Any]],
+                 max_batch_size: int = 64, max_latency_ms: float = 2.0, enabled: bool = True):
+        self.name = name
+        self.batch_fn = batch_fn
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_latency = max(0.0, max_latency_ms) / 1000
+        self.enabled = enabled
+
+        self._window = self.max_latency
+        self._pending: List[Tuple[Any, asyncio.Future]] = []
+        self._timer: Optional[asyncio.TimerHandle] = None
+
+        # Metrics
+        self._batches = 0
+        self._items = 0
+        self._max_batch = 0
+        self._flush_reasons = {'size': 0, 'timeout': 0}
+        self._histogram = [0] * (len(BATCH_SIZE_BUCKETS) + 1)
+        self._batch_seconds = 0.0
+        self._errors = 0
+
+        register_metrics_source(f"batching.{name}", self.stats)
+
+    async def submit(self, item: Any) -> Any:
+        """Queue an item and wait for its result"""
+        if not self.enabled:
+            return self.batch_fn([item])[0]
+
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((item, future))
+
+        if len(self._pending) >= self.max_batch_size:
+            self._flush('size')
+        elif self._timer is None:
+            self._timer = loop.call_later(self._window, self._flush, 'timeout')
+
+        return await future
+
+    def _flush(self, reason: str) -> None:
+        """Run the batch function over everything collected so far"""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+        batch, self._pending = self._pending, []
+        if not batch:
+            return
+
+        self._adapt_window(reason, len(batch))
+
+        started = time.perf_counter()
+        try:
+            results = self.batch_fn([item for item, _ in batch])
+            if len(results) != len(batch):
+                raise RuntimeError(f"{self.name}: batch returned {len(results)} results for {len(batch)} items")
+        except Exception as e:
+            self._errors += 1
+            logger.warning(f"Micro-batch {self.name} failed: {e}")
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        finally:
+            self._record(reason, len(batch), time.perf_counter() - started)
+
+        for (_, future), result in zip(batch, results):
+            if not future.done():
+                future.set_result(result)
+
+    def _adapt_window(self, reason: str, size: int) -> None:
+        """Shrink the window for lone requests, grow it when batches fill"""
+        if reason == 'timeout' and size == 1:
+            self._window /= 2
+            if self._window < self.max_latency / 64:
+                self._window = 0.0
+        elif reason == 'size' or size > 1:
+            self._window = min(self.max_latency, max(self._window * 2, self.max_latency / 16))
+
+    def _record(self, reason: str, size: int, seconds: float) -> None:
+        """Update batch size metrics"""
+        self._batches += 1
+        self._items += size
+        self._max_batch = max(self._max_batch, size)
+        self._flush_reasons[reason] += 1
+        self._batch_seconds += seconds
+        for i, upper in enumerate(BATCH_SIZE_BUCKETS):
+            if size <= upper:
+                self._histogram[i] += 1
+                break
+        else:
+            self._histogram[-1] += 1
+
+    def stats(self) -> Dict[str, Any]:
+        """Snapshot of realized batch sizes and timings"""
+        labels = [f"<={upper}" for upper in BATCH_SIZE_BUCKETS] + [f">{BATCH_SIZE_BUCKETS[-1]}"]
+        return {
+            'enabled': self.enabled,
+            'max_batch_size': self.max_batch_size,
+            'max_latency_ms': round(self.max_latency * 1000, 3),
+            'current_window_ms': round(self._window * 1000, 3),
+            'batches': self._batches,
+            'items': self._items,
+            'avg_batch_size': round(self._items / self._batches, 2) if self._batches else 0.0,
+            'max_batch_size_seen': self._max_batch,
+            'flush_reasons': dict(self._flush_reasons),
+            'batch_size_histogram': dict(zip(labels, self._histogram)),
+            'avg_batch_ms': round(self._batch_seconds * 1000 / self._batches, 3) if self._batches else 0.0,
+            'errors': self._errors,
+        }
@@ -45,6 +45,25 @@ class Settings(BaseSettings):
     MODEL_STORAGE_PATH: str = "./models"
     MODEL_VERSION: str = "1.0.0"
     
+    # Micro-batching for per-item inference endpoints
+    MICROBATCH_ENABLED: bool = True
+    MICROBATCH_MAX_BATCH_SIZE: int = 64
+    MICROBATCH_MAX_LATENCY_MS: float = 2.0
+    
+    # Rolling metric baselines (anomaly detection)
+    BASELINE_SNAPSHOT_PATH: str = "./models/metric_baselines.npz"
+    BASELINE_ALPHA: float = 0.05
+    BASELINE_Z_THRESHOLD: float = 3.0
+    
+    # Security alert correlation (deduplication window)
+    ALERT_CORRELATION_WINDOW_SECONDS: float = 60.0
+    ALERT_CORRELATION_MAX_GROUPS: int = 10000
+    ALERT_CORRELATION_REDIS: bool = False  # share counters across workers via Redis
+    
+    # IP range files (one CIDR per line, optional label); comma-separated paths
+    IP_INTERNAL_RANGES_PATH: Optional[str] = None
+    IP_BLOCKLIST_PATH: Optional[str] = None
+    
     # Cloud Provider
     CLOUD_PROVIDER: str = "aws"
     AWS_ACCESS_KEY_ID: Optional[str] = None
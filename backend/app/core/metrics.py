@@ -0,0 +1,34 @@
+"""In-process metrics registry
+
+Components register a callable that returns a snapshot of their counters;
+``collect_metrics`` gathers every snapshot for the metrics endpoint.
+"""
+
+import logging
+from typing import Any, Callable, Dict
+
+logger = logging.getLogger(__name__)
+
+_sources: Dict[str, Callable[[], Dict[str, Any]]] = {}
+
+
+def register_metrics_source(name: str, source: Callable[[], Dict[str, Any]]) -> None:
+    """Register (or replace) a named metrics snapshot callable"""
+    _sources[name] = source
+
+
+def unregister_metrics_source(name: str) -> None:
+    """Remove a metrics source if present"""
+    _sources.pop(name, None)
+
+
+def collect_metrics() -> Dict[str, Any]:
+    """Collect a snapshot from every registered source"""
+    snapshot = {}
+    for name, source in list(_sources.items()):
+        try:
+            snapshot[name] = source()
+        except Exception as e:
+            logger.warning(f"Metrics source {name} failed: {e}")
+            snapshot[name] = {'error': str(e)}
+    return snapshot
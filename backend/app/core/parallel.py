@@ -0,0 +1,53 @@
+"""Row-sharded parallel execution for vectorized NumPy workloads"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+
+def resolve_jobs(n_jobs: Optional[int]) -> int:
+    """Translate ``n_jobs`` (None/1 = serial, -1 = all cores) into a worker count"""
+    if n_jobs is None or n_jobs == 0:
+        return 1
+    if n_jobs < 0:
+        return max(1, (os.cpu_count() or 1) + 1 + n_jobs)
+    return n_jobs
+
+
+def shard_bounds(n_rows: int, n_shards: int) -> List[tuple]:
+    """Split ``n_rows`` into at most ``n_shards`` contiguous (start, stop) ranges"""
+    n_shards = max(1, min(n_shards, n_rows))
+    step, extra = divmod(n_rows, n_shards)
+    bounds, start = [], 0
+    for i in range(n_shards):
+        stop = start + step + (1 if i < extra else 0)
+        bounds.append((start, stop))
+        start = stop
+    return bounds
+
+
+def map_row_shards(fn: Callable[..., Any], rows: Sequence[Any], n_jobs: Optional[int] = 1,
+                   min_rows_per_shard: int = 1, **kwargs) -> List[Any]:
+    """Apply ``fn(rows[start:stop], **kwargs)`` to row shards across processes
+
+    ``fn`` must be a module-level function so it can be pickled. Results are
+    returned in shard order; with a single worker ``fn`` runs in-process.
+    """
+    n_rows = len(rows)
+    workers = min(resolve_jobs(n_jobs), max(1, n_rows // max(1, min_rows_per_shard)))
+    if workers <= 1:
+        return [fn(rows, **kwargs)]
+
+    bounds = shard_bounds(n_rows, workers)
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(fn, rows[start:stop], **kwargs) for start, stop in bounds]
+        return [future.result() for future in futures]
+
+
+def concat_shard_results(results: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Concatenate dict-of-array shard results along the row axis"""
+    import numpy as np
+
+    if len(results) == 1:
+        return results[0]
+    return {key: np.concatenate([r[key] for r in results], axis=0) for key in results[0]}
@@ -0,0 +1,62 @@
+"""Incremental request-body parsing for bulk endpoints
+
+Request bodies are consumed as they arrive (``request.stream()``) instead of
+being buffered whole. NDJSON bodies are split into lines across chunk
+boundaries and parsed one record at a time; a malformed line yields an
+``InvalidRecord`` in its place so callers can report it by position without
+aborting the rest of the stream.
+"""
+
+import json
+from typing import Any, AsyncIterator, Callable
+
+try:
+    import orjson
+    _loads: Callable[[Any], Any] = orjson.loads
+except ImportError:  # pragma: no cover - optional speedup
+    _loads = json.loads
+
+NDJSON_MEDIA_TYPES = ('application/x-ndjson', 'application/ndjson', 'application/jsonl', 'application/json-seq')
+MAX_LINE_BYTES = 1 << 20
+
+
+class InvalidRecord:
+    """Placeholder for an NDJSON line that could not be parsed"""
+
+    __slots__ = ('error',)
+
+    def __init__(self, error: str):
+        self.error = error
+
+
+def is_ndjson(content_type: str) -> bool:
+    return (content_type or '').split(';', 1)[0].strip().lower() in NDJSON_MEDIA_TYPES
+
+
+async def aiter_lines(chunks: AsyncIterator[bytes], max_line_bytes: int = MAX_LINE_BYTES) -> AsyncIterator[bytes]:
+    """Split a byte stream into lines; over-long lines raise ``ValueError``"""
+    pending = b''
+    async for chunk in chunks:
+        if not chunk:
+            continue
+        pending += chunk
+        lines = pending.split(b'\n')
+        pending = lines.pop()
+        if len(pending) > max_line_bytes:
+            raise ValueError(f"NDJSON line exceeds {max_line_bytes} bytes")
+        for line in lines:
+            yield line
+    if pending:
+        yield pending
+
+
+async def aiter_ndjson(chunks: AsyncIterator[bytes], max_line_bytes: int = MAX_LINE_BYTES) -> AsyncIterator[Any]:
+    """Parse NDJSON records from a byte stream (blank lines are skipped)"""
+    async for line in aiter_lines(chunks, max_line_bytes):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            yield _loads(line)
+        except ValueError as e:
+            yield InvalidRecord(f"Invalid JSON: {e}")
@@ -3,8 +3,6 @@
 from sqlalchemy import create_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
-from pymongo import MongoClient
-import redis
 from ..core.config import settings
 import logging
 
@@ -39,6 +37,13 @@ def get_engine():
     return _engine
 
 
+def get_session_factory():
+    """Session factory for work outside a request (background tasks, jobs)."""
+    if get_engine() is None or _SessionLocal is None:
+        raise RuntimeError("Database session is unavailable")
+    return _SessionLocal
+
+
 def get_db():
     """Get SQLAlchemy database session."""
     engine = get_engine()
@@ -52,8 +57,15 @@ def get_db():
         db.close()
 
 
-# Backward-compatible exported engine for scripts that import it directly.
-engine = get_engine()
+def __getattr__(name):
+    """Resolve the backward-compatible ``engine`` export on first access.
+
+    Scripts that do ``from backend.app.db.database import engine`` still work,
+    but importing this module no longer creates the engine eagerly.
+    """
+    if name == "engine":
+        return get_engine()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 def get_mongo_db():
@@ -61,6 +73,9 @@ def get_mongo_db():
     global _mongo_client, _mongo_db
     if _mongo_db is None:
         try:
+            # Imported lazily: pymongo pulls in dnspython and costs ~100ms at import
+            from pymongo import MongoClient
+
             _mongo_client = MongoClient(
                 settings.mongodb_url,
                 serverSelectionTimeoutMS=10000
@@ -80,6 +95,8 @@ def get_redis():
     global _redis_client
     if _redis_client is None:
         try:
+            import redis
+
             _redis_client = redis.Redis(
                 host=settings.REDIS_HOST,
                 port=settings.REDIS_PORT,
@@ -94,5 +111,6 @@ def get_redis():
             logger.info("Redis connected successfully")
         except Exception as e:
             logger.warning(f"Could not connect to Redis: {e}")
+            _redis_client = None
             return None
     return _redis_client
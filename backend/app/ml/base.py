@@ -3,11 +3,13 @@
 import pickle
 import json
 import os
-from typing import Any, Dict, Optional
-import numpy as np
+from typing import TYPE_CHECKING, Any, Dict, Optional
 from datetime import datetime
 from backend.app.core.config import settings
 
+if TYPE_CHECKING:
+    import numpy as np
+
 
 class MLModelBase:
     """Base class for ML models"""
@@ -93,6 +95,8 @@ class ModelRegistry:
 # Feature engineering utilities
 def extract_text_features(text: str) -> Dict[str, Any]:
     """Extract features from text"""
+    import numpy as np
+
     words = text.split()
     return {
         'length': len(text),
@@ -102,8 +106,10 @@ def extract_text_features(text: str) -> Dict[str, Any]:
     }
 
 
-def normalize_features(features: np.ndarray) -> np.ndarray:
+def normalize_features(features: "np.ndarray") -> "np.ndarray":
     """Normalize features to 0-1 range"""
+    import numpy as np
+
     min_val = np.min(features, axis=0)
     max_val = np.max(features, axis=0)
     range_val = max_val - min_val
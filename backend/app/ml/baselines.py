@@ -0,0 +1,293 @@
+"""Rolling-baseline anomaly detection for metric streams
+
+``BaselineEngine`` keeps an online baseline per metric key (EWMA mean and
+variance plus streaming quantile estimates) in contiguous NumPy arrays, one
+row per key. Observations are ingested in batches: each is scored against
+its key's baseline *before* that baseline absorbs it, so a spike is judged
+against history rather than against itself.
+
+Keys are free-form strings; a dotted prefix keeps domains apart, e.g.
+``security.failed_logins`` or ``kpi.daily_revenue``.
+"""
+
+import logging
+import os
+import threading
+from statistics import NormalDist
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_QUANTILES = (0.05, 0.5, 0.95)
+
+
+class BaselineEngine:
+    """Per-key EWMA mean/variance and streaming quantiles with batch scoring
+
+    - ``alpha``: EWMA weight of a new observation (the first ``1/alpha``
+      observations use a running average so early baselines are unbiased)
+    - ``z_threshold``: |z| at or above which an observation is anomalous
+    - ``quantiles``: tracked quantile levels; the lowest and highest form a
+      band, and observations beyond it by more than ``quantile_fence`` band
+      widths are anomalous (robust to skewed metrics)
+    - ``warmup``: observations a key needs before it can flag anomalies
+    - ``quantile_rate``: quantile step size, in units of the key's std dev
+    """
+
+    def __init__(self, alpha: float = 0.05, z_threshold: float = 3.0,
+                 quantiles: Sequence[float] = DEFAULT_QUANTILES, quantile_fence: float = 1.0,
+                 warmup: int = 10, quantile_rate: float = 0.05, capacity: int = 1024):
+        if not 0 < alpha <= 1:
+            raise ValueError("alpha must be in (0, 1]")
+        levels = np.asarray(sorted(quantiles), dtype=np.float64)
+        if len(levels) < 2 or levels[0] <= 0 or levels[-1] >= 1:
+            raise ValueError("quantiles needs at least two levels strictly between 0 and 1")
+
+        self.alpha = alpha
+        self.z_threshold = z_threshold
+        self.quantile_levels = levels
+        # Normal-approximation quantile offsets (in std devs) used during warmup
+        self._normal_offsets = np.array([NormalDist().inv_cdf(level) for level in levels.tolist()])
+        self.quantile_fence = quantile_fence
+        self.warmup = warmup
+        self.quantile_rate = quantile_rate
+
+        self._lock = threading.Lock()
+        self._slots: Dict[str, int] = {}
+        self.keys: List[str] = []
+        self._allocate(capacity)
+        self.observations = 0
+        self.anomalies = 0
+
+    def _allocate(self, capacity: int) -> None:
+        self.count = np.zeros(capacity, dtype=np.int64)
+        self.mean = np.zeros(capacity, dtype=np.float64)
+        self.var = np.zeros(capacity, dtype=np.float64)
+        self.quantiles = np.zeros((capacity, len(self.quantile_levels)), dtype=np.float64)
+        self.last_value = np.full(capacity, np.nan, dtype=np.float64)
+
+    def _grow(self, needed: int) -> None:
+        capacity = len(self.count)
+        if needed <= capacity:
+            return
+        old = (self.count, self.mean, self.var, self.quantiles, self.last_value)
+        self._allocate(max(needed, 2 * capacity))
+        for new, previous in zip((self.count, self.mean, self.var, self.quantiles, self.last_value), old):
+            new[:capacity] = previous
+
+    def slots_for(self, keys: Sequence[str]) -> np.ndarray:
+        """Map metric keys to row indices, creating rows for unseen keys"""
+        slots = self._slots
+        new_keys = [key for key in dict.fromkeys(keys) if key not in slots]
+        if new_keys:
+            start = len(self.keys)
+            self._grow(start + len(new_keys))
+            for offset, key in enumerate(new_keys):
+                slots[key] = start + offset
+            self.keys.extend(new_keys)
+        return np.fromiter((slots[key] for key in keys), dtype=np.int64, count=len(keys))
+
+    @staticmethod
+    def _rounds(slots: np.ndarray) -> np.ndarray:
+        """Occurrence rank of each observation among those with the same key"""
+        order = np.argsort(slots, kind='stable')
+        sorted_slots = slots[order]
+        starts = np.flatnonzero(np.r_[True, sorted_slots[1:] != sorted_slots[:-1]])
+        group_start = np.repeat(starts, np.diff(np.r_[starts, len(slots)]))
+        rank = np.empty(len(slots), dtype=np.int64)
+        rank[order] = np.arange(len(slots)) - group_start
+        return rank
+
+    def _score(self, slots: np.ndarray, values: np.ndarray) -> Dict[str, np.ndarray]:
+        """Score observations against current baselines (slots are unique)"""
+        count = self.count[slots]
+        mean = self.mean[slots]
+        std = np.sqrt(self.var[slots])
+        with np.errstate(divide='ignore', invalid='ignore'):
+            z = np.where(std > 0, (values - mean) / std, 0.0)
+
+        low = self.quantiles[slots, 0]
+        high = self.quantiles[slots, -1]
+        fence = self.quantile_fence * (high - low)
+        outside = (values < low - fence) | (values > high + fence)
+
+        warm = count >= self.warmup
+        anomalous = warm & ((np.abs(z) >= self.z_threshold) | (outside & (fence > 0)))
+        return {'z_score': np.where(warm, z, 0.0), 'outside_band': warm & outside, 'anomalous': anomalous}
+
+    def _update(self, slots: np.ndarray, values: np.ndarray) -> None:
+        """Fold one observation per (unique) slot into the baselines"""
+        count = self.count[slots] + 1
+        self.count[slots] = count
+
+        alpha = np.maximum(self.alpha, 1.0 / count)
+        diff = values - self.mean[slots]
+        increment = alpha * diff
+        self.mean[slots] += increment
+        self.var[slots] = (1 - alpha) * (self.var[slots] + diff * increment)
+
+        # Stochastic-approximation quantiles, step scaled by the key's spread;
+        # seeded from the normal approximation until the key is warm
+        std = np.sqrt(self.var[slots])
+        q = self.quantiles[slots]
+        step = self.quantile_rate * np.maximum(std, 1e-12)
+        q += step[:, None] * (self.quantile_levels[None, :] - (values[:, None] < q))
+        early = count <= self.warmup
+        q[early] = self.mean[slots][early, None] + self._normal_offsets[None, :] * std[early, None]
+        self.quantiles[slots] = np.sort(q, axis=1)
+        self.last_value[slots] = values
+
+    def ingest(self, keys: Sequence[str], values: Any) -> Dict[str, np.ndarray]:
+        """Score then absorb a batch of observations
+
+        Observations of the same key are applied in order, so a batch gives
+        the same result as feeding the observations one at a time.
+        """
+        values = np.asarray(values, dtype=np.float64).reshape(-1)
+        if len(values) != len(keys):
+            raise ValueError("keys and values must have the same length")
+        if not np.isfinite(values).all():
+            raise ValueError("values must be finite numbers")
+
+        n = len(values)
+        z_score = np.zeros(n)
+        outside = np.zeros(n, dtype=bool)
+        anomalous = np.zeros(n, dtype=bool)
+        expected = np.zeros(n)
+
+        with self._lock:
+            slots = self.slots_for(keys)
+            rank = self._rounds(slots) if n else slots
+            by_round = np.argsort(rank, kind='stable')
+            bounds = np.cumsum(np.bincount(rank)) if n else []
+            start = 0
+            for stop in bounds:
+                idx = by_round[start:stop]
+                start = stop
+                s, v = slots[idx], values[idx]
+                expected[idx] = self.mean[s]
+                scored = self._score(s, v)
+                z_score[idx] = scored['z_score']
+                outside[idx] = scored['outside_band']
+                anomalous[idx] = scored['anomalous']
+                self._update(s, v)
+
+            self.observations += n
+            self.anomalies += int(anomalous.sum())
+
+        return {'slot': slots, 'expected': expected, 'z_score': z_score,
+                'outside_band': outside, 'anomalous': anomalous}
+
+    def observe(self, observations: Sequence[Dict[str, Any]]) -> Dict[str, Any]:
+        """Ingest ``[{key, value}, ...]`` and report per-observation verdicts"""
+        keys = [str(o['key']) for o in observations]
+        result = self.ingest(keys, [o['value'] for o in observations])
+        return {
+            'observations': len(keys),
+            'anomalies': int(result['anomalous'].sum()),
+            'results': [
+                {'key': key, 'value': float(value), 'expected': round(float(expected), 4),
+                 'z_score': round(float(z), 3), 'is_anomalous': bool(flag)}
+                for key, value, expected, z, flag in zip(
+                    keys, (o['value'] for o in observations), result['expected'].tolist(),
+                    result['z_score'].tolist(), result['anomalous'].tolist()
+                )
+            ],
+        }
+
+    def baseline(self, key: str) -> Optional[Dict[str, Any]]:
+        """Current baseline for one key, or None if it has never been observed"""
+        i = self._slots.get(key)
+        if i is None:
+            return None
+        return {
+            'key': key,
+            'count': int(self.count[i]),
+            'mean': round(float(self.mean[i]), 6),
+            'std': round(float(np.sqrt(self.var[i])), 6),
+            'quantiles': {f"p{level * 100:g}": round(float(q), 6)
+                          for level, q in zip(self.quantile_levels.tolist(), self.quantiles[i].tolist())},
+            'last_value': float(self.last_value[i]),
+        }
+
+    def stats(self) -> Dict[str, Any]:
+        return {'keys': len(self.keys), 'observations': self.observations, 'anomalies': self.anomalies}
+
+    def save(self, path: str) -> None:
+        """Write a snapshot atomically (temp file + rename)"""
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{path}.tmp"
+        with self._lock:
+            n = len(self.keys)
+            with open(tmp_path, 'wb') as handle:
+                np.savez(
+                    handle,
+                    keys=np.array(self.keys, dtype=np.str_),
+                    count=self.count[:n], mean=self.mean[:n], var=self.var[:n],
+                    quantiles=self.quantiles[:n], last_value=self.last_value[:n],
+                    quantile_levels=self.quantile_levels,
+                    params=np.array([self.alpha, self.z_threshold, self.quantile_fence,
+                                     self.warmup, self.quantile_rate]),
+                )
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: str) -> 'BaselineEngine':
+        """Restore an engine from a snapshot written by ``save``"""
+        with np.load(path, allow_pickle=False) as data:
+            alpha, z_threshold, quantile_fence, warmup, quantile_rate = data['params'].tolist()
+            keys = data['keys'].tolist()
+            engine = cls(alpha=alpha, z_threshold=z_threshold, quantiles=data['quantile_levels'].tolist(),
+                         quantile_fence=quantile_fence, warmup=int(warmup), quantile_rate=quantile_rate,
+                         capacity=max(1024, len(keys)))
+            n = len(keys)
+            engine.keys = keys
+            engine._slots = {key: i for i, key in enumerate(keys)}
+            engine.count[:n] = data['count']
+            engine.mean[:n] = data['mean']
+            engine.var[:n] = data['var']
+            engine.quantiles[:n] = data['quantiles']
+            engine.last_value[:n] = data['last_value']
+        return engine
+
+
+_engine: Optional[BaselineEngine] = None
+_engine_lock = threading.Lock()
+
+
+def get_baseline_engine() -> BaselineEngine:
+    """Process-wide engine, restored from ``BASELINE_SNAPSHOT_PATH`` when a snapshot exists"""
+    global _engine
+    if _engine is None:
+        with _engine_lock:
+            if _engine is None:
+                from backend.app.core.config import settings
+                from backend.app.core.metrics import register_metrics_source
+
+                path = settings.BASELINE_SNAPSHOT_PATH
+                engine = None
+                if os.path.exists(path):
+                    try:
+                        engine = BaselineEngine.load(path)
+                        logger.info(f"Loaded {len(engine.keys)} metric baselines from {path}")
+                    except (OSError, KeyError, ValueError) as e:
+                        logger.warning(f"Could not load baseline snapshot {path}: {e}")
+                if engine is None:
+                    engine = BaselineEngine(alpha=settings.BASELINE_ALPHA, z_threshold=settings.BASELINE_Z_THRESHOLD)
+                register_metrics_source('baselines', engine.stats)
+                _engine = engine
+    return _engine
+
+
+def save_baseline_snapshot() -> Optional[str]:
+    """Persist the process-wide engine if it has been created"""
+    if _engine is None:
+        return None
+    from backend.app.core.config import settings
+
+    _engine.save(settings.BASELINE_SNAPSHOT_PATH)
+    return settings.BASELINE_SNAPSHOT_PATH
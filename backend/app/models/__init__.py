@@ -2,12 +2,12 @@
 
 from .models import (
     User, Department, Employee, Resume,
-    Transaction, Budget, SupportTicket,
+    Transaction, TransactionRollup, Budget, SupportTicket,
     Campaign, Lead, Customer, SecurityAlert, MLModel
 )
 
 __all__ = [
     "User", "Department", "Employee", "Resume",
-    "Transaction", "Budget", "SupportTicket",
+    "Transaction", "TransactionRollup", "Budget", "SupportTicket",
     "Campaign", "Lead", "Customer", "SecurityAlert", "MLModel"
 ]
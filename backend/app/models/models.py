@@ -1,6 +1,6 @@
 """Database Models"""
 
-from sqlalchemy import Column, Integer, String, Float, Boolean, DateTime, Text, ForeignKey, JSON
+from sqlalchemy import Column, Integer, String, Float, Boolean, DateTime, Text, ForeignKey, JSON, UniqueConstraint
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from backend.app.db.database import Base
@@ -86,6 +86,23 @@ class Transaction(Base):
     created_at = Column(DateTime(timezone=True), server_default=func.now())
 
 
+class TransactionRollup(Base):
+    """Pre-aggregated transaction totals per period, type and category"""
+    __tablename__ = "transaction_rollups"
+    __table_args__ = (
+        UniqueConstraint("period", "period_start", "transaction_type", "category", name="uq_transaction_rollup"),
+    )
+    
+    id = Column(Integer, primary_key=True, index=True)
+    period = Column(String, nullable=False)  # day, week, month
+    period_start = Column(DateTime, nullable=False, index=True)
+    transaction_type = Column(String, nullable=False)  # income, expense
+    category = Column(String, nullable=False, default="")  # "" = uncategorized
+    total_amount = Column(Float, nullable=False, default=0)
+    transaction_count = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+
 class Budget(Base):
     """Budget Model"""
     __tablename__ = "budgets"
@@ -167,6 +184,14 @@ class Customer(Base):
     email = Column(String, unique=True)
     company = Column(String)
     industry = Column(String)
+    # Churn / CLV features
+    last_activity_at = Column(DateTime)
+    support_ticket_count = Column(Integer, default=0)
+    payment_failures = Column(Integer, default=0)
+    engagement_score = Column(Float)
+    avg_purchase_value = Column(Float)
+    purchase_frequency = Column(Float)  # purchases per year
+    customer_lifespan_months = Column(Float)
     lifetime_value = Column(Float)  # ML prediction
     churn_risk = Column(Float)  # ML prediction
     is_active = Column(Boolean, default=True)
@@ -187,6 +212,10 @@ class SecurityAlert(Base):
     is_threat = Column(Boolean)  # ML prediction
     threat_score = Column(Float)  # ML anomaly score
     status = Column(String, default="open")  # open, investigating, resolved, false_positive
+    occurrence_count = Column(Integer, default=1)  # correlated duplicates folded into this row
+    first_seen = Column(DateTime(timezone=True))
+    last_seen = Column(DateTime(timezone=True))
+    correlation_key = Column(String, index=True)  # alert_type|source_ip|destination_ip
     created_at = Column(DateTime(timezone=True), server_default=func.now())
 
 
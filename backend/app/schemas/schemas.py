@@ -1,7 +1,7 @@
 """Pydantic Schemas for API validation"""
 
 from pydantic import BaseModel, EmailStr
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Union
 from datetime import datetime
 
 
@@ -196,6 +196,17 @@ class CustomerCreate(BaseModel):
     industry: Optional[str] = None
 
 
+class CustomerHealthRequest(BaseModel):
+    customer_id: Optional[Union[int, str]] = None
+    days_since_last_activity: float = 0
+    support_tickets: int = 0
+    payment_failures: int = 0
+    engagement_score: float = 50
+    avg_purchase_value: float = 0
+    purchase_frequency: float = 0
+    customer_lifespan_months: float = 24
+
+
 class CustomerResponse(BaseModel):
     id: int
     customer_id: str
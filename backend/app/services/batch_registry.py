@@ -0,0 +1,152 @@
+"""Unified batch inference across department services
+
+Each registered service names the Pydantic schema its single-record endpoint
+validates with, how a validated record maps onto the service payload, and the
+service's batch function (imported lazily on first use). ``stream_batch``
+consumes records from any async source in chunks: each chunk is validated
+record by record, the valid records go to the batch function in one call, and
+one NDJSON result line per input record is yielded in input order.
+"""
+
+import json
+import logging
+from importlib import import_module
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional, Type
+
+from pydantic import BaseModel, ValidationError
+
+from backend.app.core.metrics import register_metrics_source
+from backend.app.core.streaming import InvalidRecord
+from backend.app.schemas.schemas import (
+    CustomerHealthRequest,
+    LeadCreate,
+    ResumeCreate,
+    SecurityAlertCreate,
+    TicketCreate,
+    TransactionCreate
+)
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CHUNK_SIZE = 500
+MAX_CHUNK_SIZE = 10_000
+
+
+class BatchService:
+    """A batch-capable service: request schema, payload mapping and batch function"""
+
+    def __init__(self, name: str, schema: Type[BaseModel], batch_fn: str,
+                 to_payload: Optional[Callable[[BaseModel], Dict[str, Any]]] = None):
+        self.name = name
+        self.schema = schema
+        self.batch_fn_path = batch_fn
+        self.to_payload = to_payload or (lambda record: record.model_dump())
+        self._batch_fn: Optional[Callable[[List[Dict[str, Any]]], List[Any]]] = None
+        self.records = 0
+        self.invalid = 0
+        self.failed = 0
+        self.chunks = 0
+
+    @property
+    def batch_fn(self) -> Callable[[List[Dict[str, Any]]], List[Any]]:
+        if self._batch_fn is None:
+            module, _, attr = self.batch_fn_path.partition(':')
+            self._batch_fn = getattr(import_module(module), attr)
+        return self._batch_fn
+
+    def process_chunk(self, start: int, records: List[Any]) -> List[Dict[str, Any]]:
+        """Validate and run one chunk; returns one result line per record, in order"""
+        lines: List[Optional[Dict[str, Any]]] = [None] * len(records)
+        valid_positions, payloads = [], []
+
+        for position, record in enumerate(records):
+            if isinstance(record, InvalidRecord):
+                lines[position] = {'index': start + position, 'error': record.error}
+                continue
+            try:
+                payloads.append(self.to_payload(self.schema.model_validate(record)))
+                valid_positions.append(position)
+            except ValidationError as e:
+                lines[position] = {'index': start + position,
+                                   'error': e.errors(include_url=False, include_context=False)}
+
+        if payloads:
+            try:
+                results = [{'result': result} for result in self.batch_fn(payloads)]
+            except Exception:
+                # Isolate the failing record(s) instead of failing the whole chunk
+                results = [self._run_one(payload) for payload in payloads]
+            for position, result in zip(valid_positions, results):
+                lines[position] = {'index': start + position, **result}
+
+        self.chunks += 1
+        self.records += len(records)
+        self.invalid += len(records) - len(payloads)
+        return lines
+
+    def _run_one(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+        try:
+            return {'result': self.batch_fn([payload])[0]}
+        except Exception as e:
+            self.failed += 1
+            logger.warning(f"Batch service {self.name} failed on a record: {e}")
+            return {'error': f"{type(e).__name__}: {e}"}
+
+    def stats(self) -> Dict[str, int]:
+        return {'records': self.records, 'invalid': self.invalid, 'failed': self.failed, 'chunks': self.chunks}
+
+
+BATCH_SERVICES: Dict[str, BatchService] = {}
+
+
+def register_batch_service(service: BatchService) -> None:
+    """Register (or replace) a service under its name"""
+    BATCH_SERVICES[service.name] = service
+
+
+def get_batch_service(name: str) -> BatchService:
+    """Look up a registered service; raises ``KeyError`` for unknown names"""
+    return BATCH_SERVICES[name]
+
+
+for _service in (
+    BatchService('hr.screen_resume', ResumeCreate, 'backend.app.services.hr:screen_resumes',
+                 lambda r: {'resume_text': r.resume_text, 'candidate_name': r.candidate_name, 'email': r.email}),
+    BatchService('finance.analyze_transaction', TransactionCreate, 'backend.app.services.finance:analyze_transactions'),
+    BatchService('support.analyze_ticket', TicketCreate, 'backend.app.services.customer_support:analyze_support_tickets'),
+    BatchService('marketing.score_lead', LeadCreate, 'backend.app.services.marketing:score_and_prioritize_leads'),
+    BatchService('sales.customer_health', CustomerHealthRequest,
+                 'backend.app.services.sales:analyze_customer_health_batch'),
+    BatchService('security.analyze_alert', SecurityAlertCreate,
+                 'backend.app.services.cybersecurity:analyze_security_alerts',
+                 lambda r: {'type': r.alert_type, 'severity': r.severity, 'source_ip': r.source_ip,
+                            'destination_ip': r.destination_ip, 'description': r.description}),
+):
+    register_batch_service(_service)
+
+register_metrics_source('batch_api', lambda: {name: service.stats() for name, service in BATCH_SERVICES.items()})
+
+
+def _encode(line: Dict[str, Any]) -> bytes:
+    return json.dumps(line, default=str, separators=(',', ':')).encode() + b'\n'
+
+
+async def stream_batch(service: BatchService, records: AsyncIterator[Any],
+                       chunk_size: int = DEFAULT_CHUNK_SIZE) -> AsyncIterator[bytes]:
+    """Yield NDJSON result lines for ``records``, processing ``chunk_size`` at a time"""
+    from starlette.concurrency import run_in_threadpool
+
+    chunk_size = max(1, min(chunk_size, MAX_CHUNK_SIZE))
+    start, chunk = 0, []
+
+    async def flush(start: int, chunk: List[Any]) -> bytes:
+        lines = await run_in_threadpool(service.process_chunk, start, chunk)
+        return b''.join(_encode(line) for line in lines)
+
+    async for record in records:
+        chunk.append(record)
+        if len(chunk) >= chunk_size:
+            yield await flush(start, chunk)
+            start, chunk = start + len(chunk), []
+    if chunk:
+        yield await flush(start, chunk)
@@ -5,6 +5,7 @@ from .support_service import (
     TicketClassifier,
     AIchatbot,
     analyze_support_ticket,
+    analyze_support_tickets,
     process_chatbot_message
 )
 
@@ -13,5 +14,6 @@ __all__ = [
     "TicketClassifier",
     "AIchatbot",
     "analyze_support_ticket",
+    "analyze_support_tickets",
     "process_chatbot_message"
 ]
@@ -105,20 +105,37 @@ class AIchatbot:
 
 def analyze_support_ticket(subject: str, description: str, customer_email: str) -> Dict[str, Any]:
     """Analyze support ticket"""
-    # Sentiment analysis
+    return analyze_support_tickets([{
+        'subject': subject,
+        'description': description,
+        'customer_email': customer_email
+    }])[0]
+
+
+def analyze_support_tickets(tickets: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Analyze a batch of support tickets, sharing one analyzer across the batch"""
     sentiment_analyzer = SentimentAnalyzer()
-    sentiment_result = sentiment_analyzer.analyze_sentiment(subject + " " + description)
+    results = []
     
-    # Classify ticket
-    category = TicketClassifier.classify(subject, description)
-    priority = TicketClassifier.determine_priority(category, sentiment_result['score'])
+    for ticket in tickets:
+        subject = ticket.get('subject', '')
+        description = ticket.get('description', '')
+        
+        # Sentiment analysis
+        sentiment_result = sentiment_analyzer.analyze_sentiment(subject + " " + description)
+        
+        # Classify ticket
+        category = TicketClassifier.classify(subject, description)
+        priority = TicketClassifier.determine_priority(category, sentiment_result['score'])
+        
+        results.append({
+            'category': category,
+            'priority': priority,
+            'sentiment': sentiment_result['sentiment'],
+            'sentiment_score': sentiment_result['score']
+        })
     
-    return {
-        'category': category,
-        'priority': priority,
-        'sentiment': sentiment_result['sentiment'],
-        'sentiment_score': sentiment_result['score']
-    }
+    return results
 
 
 def process_chatbot_message(message: str) -> Dict[str, str]:
@@ -4,12 +4,29 @@ from .security_service import (
     IntrusionDetectionSystem,
     AnomalyDetector,
     ComplianceMonitor,
-    analyze_security_alert
+    analyze_security_alert,
+    analyze_security_alerts
 )
+from .compliance_scan import ComplianceScanner, get_compliance_scanner
+from .correlation import AlertCorrelator, get_alert_correlator, write_aggregates
+from .ip_index import IPClassifier, IPRangeIndex, get_ip_classifier
+from .flow_stream import FlowStreamIDS, open_flow_source, run_flow_ids
 
 __all__ = [
     "IntrusionDetectionSystem",
     "AnomalyDetector",
     "ComplianceMonitor",
-    "analyze_security_alert"
+    "analyze_security_alert",
+    "analyze_security_alerts",
+    "ComplianceScanner",
+    "get_compliance_scanner",
+    "AlertCorrelator",
+    "get_alert_correlator",
+    "write_aggregates",
+    "IPClassifier",
+    "IPRangeIndex",
+    "get_ip_classifier",
+    "FlowStreamIDS",
+    "open_flow_source",
+    "run_flow_ids"
 ]
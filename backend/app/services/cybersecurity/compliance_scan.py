@@ -0,0 +1,245 @@
+"""Batch compliance scanning over many system configurations
+
+``ComplianceMonitor.POLICIES`` are compiled once into a rule table (config
+field, comparison, threshold, penalty). A scan turns the configurations into
+columns, evaluates every rule as one vectorized comparison to get a
+``(configs x rules)`` violation matrix, and derives scores and priorities with
+a single matrix product - the same results ``check_compliance`` gives one
+config at a time.
+
+``ComplianceScanner`` remembers a content fingerprint and violation bitmask per
+config ID, so hourly rescans only evaluate configs whose policy-relevant
+fields changed, and keeps per-rule violation counts current incrementally.
+Large rescans can be split across processes.
+"""
+
+import threading
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+
+from backend.app.core.parallel import concat_shard_results, map_row_shards
+from .security_service import ComplianceMonitor
+
+
+def compile_rules(policies: Optional[Dict[str, Any]] = None,
+                  penalties: Optional[Dict[str, int]] = None) -> List[Dict[str, Any]]:
+    """Translate policy settings into a rule table (disabled policies are skipped)"""
+    policies = ComplianceMonitor.POLICIES if policies is None else policies
+    penalties = ComplianceMonitor.PENALTIES if penalties is None else penalties
+    rules = [{
+        'name': 'password_strength', 'field': 'password_min_length', 'default': 0,
+        'op': 'lt', 'threshold': policies['password_strength']['min_length'],
+        'penalty': penalties['password_strength'], 'message': 'Password minimum length below policy',
+    }]
+    if policies.get('mfa_required'):
+        rules.append({
+            'name': 'mfa_required', 'field': 'mfa_enabled', 'default': False, 'op': 'falsy',
+            'penalty': penalties['mfa_required'], 'message': 'Multi-factor authentication not enabled',
+        })
+    if policies.get('encryption_required'):
+        rules.append({
+            'name': 'encryption_required', 'field': 'encryption_at_rest', 'default': False, 'op': 'falsy',
+            'penalty': penalties['encryption_required'], 'message': 'Data encryption at rest not enabled',
+        })
+    rules.append({
+        'name': 'access_review_days', 'field': 'days_since_access_review', 'default': 0,
+        'op': 'gt', 'threshold': policies['access_review_days'],
+        'penalty': penalties['access_review_days'], 'message': 'Access review overdue by {excess} days',
+    })
+    return rules
+
+
+def policy_fields(rules: Sequence[Dict[str, Any]]) -> List[str]:
+    return list(dict.fromkeys(rule['field'] for rule in rules))
+
+
+def fingerprint(config: Dict[str, Any], fields: Sequence[str]) -> tuple:
+    """Content key of a config: the values of its policy-relevant fields
+
+    Compared for equality rather than hashed to a digest, so there are no
+    collisions and no serialization cost; other fields never affect a result.
+    """
+    return tuple(map(config.get, fields))
+
+
+def _column(configs: Sequence[Dict[str, Any]], field: str, default: Any, dtype) -> np.ndarray:
+    values = [config.get(field, default) for config in configs]
+    try:
+        return np.array(values, dtype=dtype)
+    except (TypeError, ValueError):
+        # Mixed/odd values: coerce one by one, treating junk as the default
+        coerced = []
+        for value in values:
+            try:
+                coerced.append(dtype(value if value is not None else default))
+            except (TypeError, ValueError):
+                coerced.append(dtype(default))
+        return np.array(coerced, dtype=dtype)
+
+
+def evaluate_configs(configs: Sequence[Dict[str, Any]], rules: Sequence[Dict[str, Any]]) -> Dict[str, np.ndarray]:
+    """Violation matrix, scores and rule inputs for a batch of configs"""
+    n = len(configs)
+    violations = np.zeros((n, len(rules)), dtype=bool)
+    excess = np.zeros((n, len(rules)), dtype=np.float64)
+
+    for j, rule in enumerate(rules):
+        if rule['op'] == 'falsy':
+            column = np.fromiter((bool(config.get(rule['field'], rule['default'])) for config in configs),
+                                 dtype=bool, count=n)
+            violations[:, j] = ~column
+            continue
+        column = _column(configs, rule['field'], rule['default'], float)
+        if rule['op'] == 'lt':
+            violations[:, j] = column < rule['threshold']
+        else:
+            violations[:, j] = column > rule['threshold']
+            excess[:, j] = column - rule['threshold']
+
+    penalties = np.array([rule['penalty'] for rule in rules], dtype=np.int64)
+    raw_score = 100 - violations.astype(np.int64) @ penalties
+    return {'violations': violations, 'excess': excess, 'raw_score': raw_score}
+
+
+def _evaluate_shard(configs: Sequence[Dict[str, Any]], rules: Sequence[Dict[str, Any]]) -> Dict[str, np.ndarray]:
+    """Module-level shard worker so it can run in a process pool"""
+    return evaluate_configs(configs, rules)
+
+
+def priorities(raw_score: np.ndarray) -> np.ndarray:
+    return np.where(raw_score < 60, 'critical', np.where(raw_score < 80, 'high', 'normal'))
+
+
+def _format_excess(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else str(value)
+
+
+class ComplianceScanner:
+    """Incremental, vectorized compliance scanning keyed by config ID"""
+
+    def __init__(self, rules: Optional[List[Dict[str, Any]]] = None, n_jobs: Optional[int] = 1,
+                 min_configs_per_shard: int = 20_000):
+        self.rules = rules if rules is not None else compile_rules()
+        self.fields = policy_fields(self.rules)
+        self.n_jobs = n_jobs
+        self.min_configs_per_shard = min_configs_per_shard
+
+        self._lock = threading.Lock()
+        self._fingerprints: Dict[str, tuple] = {}
+        self._masks: Dict[str, int] = {}
+        self._scores: Dict[str, int] = {}
+        self.rule_counts = np.zeros(len(self.rules), dtype=np.int64)
+        self._bits = 1 << np.arange(len(self.rules), dtype=np.int64)
+
+    def _mask_counts(self, masks: Sequence[int]) -> np.ndarray:
+        if not len(masks):
+            return np.zeros(len(self.rules), dtype=np.int64)
+        array = np.fromiter(masks, dtype=np.int64, count=len(masks))
+        return ((array[:, None] & self._bits) != 0).sum(axis=0)
+
+    def scan(self, configs: Dict[str, Dict[str, Any]], prune: bool = False,
+             include_results: bool = False, n_jobs: Optional[int] = None) -> Dict[str, Any]:
+        """Scan ``{config_id: config}``, re-evaluating only new or changed configs
+
+        With ``prune`` the scan is treated as the full inventory and configs
+        missing from it are forgotten.
+        """
+        n_jobs = self.n_jobs if n_jobs is None else n_jobs
+        fields = self.fields
+        with self._lock:
+            known = self._fingerprints
+            changed_ids, changed_keys = [], []
+            for config_id, config in configs.items():
+                key = fingerprint(config, fields)
+                if known.get(config_id) != key:
+                    changed_ids.append(config_id)
+                    changed_keys.append(key)
+
+            removed = [config_id for config_id in known if config_id not in configs] if prune else []
+            old_masks = [self._masks[config_id] for config_id in changed_ids + removed if config_id in self._masks]
+            self.rule_counts -= self._mask_counts(old_masks)
+            for config_id in removed:
+                del known[config_id], self._masks[config_id], self._scores[config_id]
+
+            results = []
+            if changed_ids:
+                batch = [configs[config_id] for config_id in changed_ids]
+                evaluated = concat_shard_results(map_row_shards(
+                    _evaluate_shard, batch, n_jobs=n_jobs,
+                    min_rows_per_shard=self.min_configs_per_shard, rules=self.rules
+                ))
+                masks = (evaluated['violations'].astype(np.int64) @ self._bits).tolist()
+                scores = np.maximum(evaluated['raw_score'], 0).tolist()
+                self.rule_counts += evaluated['violations'].sum(axis=0)
+                for config_id, key, mask, score in zip(changed_ids, changed_keys, masks, scores):
+                    known[config_id] = key
+                    self._masks[config_id] = mask
+                    self._scores[config_id] = score
+                if include_results:
+                    results = self._results(changed_ids, evaluated)
+
+            summary = self._summary()
+        summary.update({
+            'configs_scanned': len(configs),
+            'configs_rescanned': len(changed_ids),
+            'configs_unchanged': len(configs) - len(changed_ids),
+            'configs_removed': len(removed),
+        })
+        if include_results:
+            summary['results'] = results
+        return summary
+
+    def _results(self, config_ids: List[str], evaluated: Dict[str, np.ndarray]) -> List[Dict[str, Any]]:
+        """Per-config results in ``check_compliance`` shape for non-compliant configs"""
+        violations, excess, raw_score = evaluated['violations'], evaluated['excess'], evaluated['raw_score']
+        priority = priorities(raw_score)
+        results = []
+        for i in np.flatnonzero(violations.any(axis=1)).tolist():
+            results.append({
+                'config_id': config_ids[i],
+                'is_compliant': False,
+                'compliance_score': max(0, int(raw_score[i])),
+                'violations': [rule['message'].format(excess=_format_excess(excess[i, j]))
+                               for j, rule in enumerate(self.rules) if violations[i, j]],
+                'priority': str(priority[i]),
+            })
+        return results
+
+    def _summary(self) -> Dict[str, Any]:
+        scores = np.fromiter(self._scores.values(), dtype=np.int64, count=len(self._scores))
+        masks = np.fromiter(self._masks.values(), dtype=np.int64, count=len(self._masks))
+        labels = priorities(scores)
+        return {
+            'configs_tracked': len(scores),
+            'compliant': int((masks == 0).sum()),
+            'average_score': round(float(scores.mean()), 2) if len(scores) else None,
+            'violations_by_rule': {rule['name']: int(count) for rule, count in zip(self.rules, self.rule_counts)},
+            'by_priority': {level: int((labels == level).sum()) for level in ('critical', 'high', 'normal')},
+        }
+
+    def result(self, config_id: str) -> Optional[Dict[str, Any]]:
+        """Last known score and violated rules for one config"""
+        mask = self._masks.get(config_id)
+        if mask is None:
+            return None
+        return {
+            'config_id': config_id,
+            'is_compliant': mask == 0,
+            'compliance_score': self._scores[config_id],
+            'violated_rules': [rule['name'] for j, rule in enumerate(self.rules) if mask >> j & 1],
+        }
+
+
+_scanner: Optional[ComplianceScanner] = None
+_scanner_lock = threading.Lock()
+
+
+def get_compliance_scanner() -> ComplianceScanner:
+    """Process-wide scanner so repeated scans are incremental"""
+    global _scanner
+    if _scanner is None:
+        with _scanner_lock:
+            if _scanner is None:
+                _scanner = ComplianceScanner()
+    return _scanner
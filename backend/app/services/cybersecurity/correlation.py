@@ -0,0 +1,246 @@
+"""Security alert correlation - deduplicate alert floods into aggregates
+
+Alerts sharing ``(alert_type, source_ip, destination_ip)`` inside a time
+window are folded into one group that counts occurrences and tracks first and
+last seen, the worst severity and the highest threat score. Groups are written
+to ``security_alerts`` once, when their window closes, so an incident that
+produces thousands of identical alerts per minute costs one row per window.
+
+Open groups live in a bounded ``OrderedDict`` (oldest first). When a new
+group would exceed ``max_groups``, the oldest group is closed early rather
+than dropped, which caps memory without losing counts.
+
+With ``redis`` set, counters are shared across API workers: each alert
+updates a Redis hash atomically (Lua), the worker that created the hash owns
+the group and writes the aggregate, and the other workers hold no local
+state for it.
+"""
+
+import logging
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import insert
+
+from backend.app.models.models import SecurityAlert
+
+logger = logging.getLogger(__name__)
+
+SEVERITY_RANK = {'low': 0, 'medium': 1, 'high': 2, 'critical': 3}
+
+# KEYS[1] group hash; ARGV: now, threat score, severity, ttl ms.
+# Returns 1 when this call created the group (caller becomes its owner).
+_REDIS_ADD = """
+local created = redis.call('HSETNX', KEYS[1], 'first_seen', ARGV[1])
+redis.call('HINCRBY', KEYS[1], 'count', 1)
+redis.call('HSET', KEYS[1], 'last_seen', ARGV[1])
+local score = tonumber(redis.call('HGET', KEYS[1], 'threat_score') or '-1')
+if tonumber(ARGV[2]) > score then
+    redis.call('HSET', KEYS[1], 'threat_score', ARGV[2], 'severity', ARGV[3])
+end
+if created == 1 then
+    redis.call('PEXPIRE', KEYS[1], ARGV[4])
+end
+return created
+"""
+
+
+def correlation_key(alert: Dict[str, Any]) -> str:
+    return f"{alert.get('alert_type') or ''}|{alert.get('source_ip') or ''}|{alert.get('destination_ip') or ''}"
+
+
+def _utc(epoch: float) -> datetime:
+    return datetime.fromtimestamp(epoch, tz=timezone.utc)
+
+
+class AlertCorrelator:
+    """Windowed, memory-bounded alert deduplication"""
+
+    def __init__(self, window_seconds: float = 60.0, max_groups: int = 10_000,
+                 redis=None, redis_prefix: str = 'alertcorr:'):
+        self.window_seconds = window_seconds
+        self.max_groups = max_groups
+        self.redis = redis
+        self.redis_prefix = redis_prefix
+        self._redis_add = redis.register_script(_REDIS_ADD) if redis is not None else None
+
+        self._groups: 'OrderedDict[str, Dict[str, Any]]' = OrderedDict()
+        self._lock = threading.Lock()
+        self.received = 0
+        self.emitted = 0
+        self.early_flushes = 0
+        self.redis_errors = 0
+
+    def add(self, alert: Dict[str, Any], now: Optional[float] = None) -> List[Dict[str, Any]]:
+        """Fold one analyzed alert in; returns aggregates closed to make room"""
+        now = time.time() if now is None else now
+        key = correlation_key(alert)
+        score = float(alert.get('threat_score') or 0.0)
+        severity = alert.get('severity') or 'medium'
+        closed: List[Dict[str, Any]] = []
+
+        with self._lock:
+            self.received += 1
+            group = self._groups.get(key)
+
+            if group is None and self._redis_add is not None:
+                try:
+                    created = self._redis_add(keys=[self.redis_prefix + key],
+                                              args=[now, score, severity, int(self.window_seconds * 2000)])
+                except Exception as e:
+                    self.redis_errors += 1
+                    logger.warning(f"Redis alert correlation failed, using local state: {e}")
+                else:
+                    if not created:
+                        return closed  # another worker owns this group
+                    group = self._new_group(key, alert, now, closed)
+                    group['shared'] = True
+                    return closed
+
+            if group is None:
+                self._new_group(key, alert, now, closed)
+            elif group.get('shared'):
+                self._redis_touch(key, now, score, severity)
+            else:
+                group['occurrence_count'] += 1
+                group['last_seen'] = now
+                group['is_threat'] = group['is_threat'] or bool(alert.get('is_threat'))
+                if score > group['threat_score']:
+                    group['threat_score'] = score
+                if SEVERITY_RANK.get(severity, 1) > SEVERITY_RANK.get(group['severity'], 1):
+                    group['severity'] = severity
+                group['description'] = alert.get('description') or group['description']
+        return closed
+
+    def _new_group(self, key: str, alert: Dict[str, Any], now: float,
+                   closed: List[Dict[str, Any]]) -> Dict[str, Any]:
+        while len(self._groups) >= self.max_groups:
+            _, oldest = self._groups.popitem(last=False)
+            closed.append(self._close(oldest))
+            self.early_flushes += 1
+        group = {
+            'correlation_key': key,
+            'alert_type': alert.get('alert_type'),
+            'source_ip': alert.get('source_ip'),
+            'destination_ip': alert.get('destination_ip'),
+            'description': alert.get('description'),
+            'severity': alert.get('severity') or 'medium',
+            'is_threat': bool(alert.get('is_threat')),
+            'threat_score': float(alert.get('threat_score') or 0.0),
+            'occurrence_count': 1,
+            'first_seen': now,
+            'last_seen': now,
+        }
+        self._groups[key] = group
+        return group
+
+    def _redis_touch(self, key: str, now: float, score: float, severity: str) -> None:
+        """Owner-side update of a shared group"""
+        try:
+            self._redis_add(keys=[self.redis_prefix + key],
+                            args=[now, score, severity, int(self.window_seconds * 2000)])
+        except Exception as e:
+            self.redis_errors += 1
+            logger.warning(f"Redis alert correlation failed: {e}")
+
+    def _close(self, group: Dict[str, Any]) -> Dict[str, Any]:
+        """Turn a group into a ``security_alerts`` row (merging shared counters)"""
+        if group.pop('shared', False):
+            name = self.redis_prefix + group['correlation_key']
+            try:
+                pipe = self.redis.pipeline()
+                pipe.hgetall(name)
+                pipe.delete(name)
+                shared, _ = pipe.execute()
+            except Exception as e:
+                self.redis_errors += 1
+                logger.warning(f"Could not read shared alert group {name}: {e}")
+                shared = {}
+            if shared:
+                group['occurrence_count'] = int(shared.get('count', group['occurrence_count']))
+                group['first_seen'] = float(shared.get('first_seen', group['first_seen']))
+                group['last_seen'] = float(shared.get('last_seen', group['last_seen']))
+                group['threat_score'] = max(group['threat_score'], float(shared.get('threat_score', 0.0)))
+                if SEVERITY_RANK.get(shared.get('severity'), -1) > SEVERITY_RANK.get(group['severity'], 1):
+                    group['severity'] = shared['severity']
+
+        self.emitted += 1
+        return {
+            **group,
+            'is_threat': group['is_threat'] or group['threat_score'] >= 0.5,
+            'threat_score': round(group['threat_score'], 2),
+            'status': 'open',
+            'first_seen': _utc(group['first_seen']),
+            'last_seen': _utc(group['last_seen']),
+            'created_at': _utc(group['first_seen']),
+        }
+
+    def flush_expired(self, now: Optional[float] = None) -> List[Dict[str, Any]]:
+        """Close every group whose window has elapsed"""
+        now = time.time() if now is None else now
+        closed = []
+        with self._lock:
+            # Groups are ordered by first_seen, so stop at the first open one
+            while self._groups:
+                key, group = next(iter(self._groups.items()))
+                if now - group['first_seen'] < self.window_seconds:
+                    break
+                del self._groups[key]
+                closed.append(self._close(group))
+        return closed
+
+    def flush_all(self) -> List[Dict[str, Any]]:
+        """Close every open group (shutdown)"""
+        with self._lock:
+            closed = [self._close(group) for group in self._groups.values()]
+            self._groups.clear()
+        return closed
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            'open_groups': len(self._groups),
+            'max_groups': self.max_groups,
+            'received': self.received,
+            'emitted': self.emitted,
+            'early_flushes': self.early_flushes,
+            'redis_shared': self.redis is not None,
+            'redis_errors': self.redis_errors,
+        }
+
+
+def write_aggregates(db, aggregates: List[Dict[str, Any]]) -> int:
+    """Bulk-insert closed groups into ``security_alerts`` and commit"""
+    if aggregates:
+        db.execute(insert(SecurityAlert), aggregates)
+        db.commit()
+    return len(aggregates)
+
+
+_correlator: Optional[AlertCorrelator] = None
+_correlator_lock = threading.Lock()
+
+
+def get_alert_correlator() -> AlertCorrelator:
+    """Process-wide correlator configured from ``ALERT_CORRELATION_*`` settings"""
+    global _correlator
+    if _correlator is None:
+        with _correlator_lock:
+            if _correlator is None:
+                from backend.app.core.config import settings
+                from backend.app.core.metrics import register_metrics_source
+
+                redis = None
+                if settings.ALERT_CORRELATION_REDIS:
+                    from backend.app.db.database import get_redis
+                    redis = get_redis()
+                correlator = AlertCorrelator(
+                    window_seconds=settings.ALERT_CORRELATION_WINDOW_SECONDS,
+                    max_groups=settings.ALERT_CORRELATION_MAX_GROUPS,
+                    redis=redis,
+                )
+                register_metrics_source('alert_correlation', correlator.stats)
+                _correlator = correlator
+    return _correlator
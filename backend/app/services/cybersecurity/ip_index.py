@@ -0,0 +1,288 @@
+"""IP range index - CIDR lookups for internal ranges and reputation lists
+
+CIDR blocks (IPv4 and IPv6) are flattened into sorted, disjoint integer
+intervals, each carrying a label; the most specific block wins where blocks
+nest. A lookup is one address parse plus one ``bisect`` over a compact
+``array('I')`` (IPv4) or a sorted int list (IPv6).
+
+Indexes are immutable. ``IPClassifier`` holds the current internal-range and
+blocklist indexes as a single tuple; ``reload`` builds replacements off to the
+side and swaps the tuple in one assignment, so lookups never block or see a
+half-built index.
+
+Range files hold one CIDR (or bare address) per line with an optional label
+after whitespace or a comma; ``#`` starts a comment.
+"""
+
+import logging
+import socket
+import struct
+import threading
+from array import array
+from bisect import bisect_right
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_INTERNAL_RANGES = (
+    '10.0.0.0/8',
+    '172.16.0.0/12',
+    '192.168.0.0/16',
+    '127.0.0.0/8',
+    '169.254.0.0/16',
+    '::1/128',
+    'fc00::/7',
+    'fe80::/10',
+)
+
+V4_BUCKETS = 1 << 16  # one bucket per IPv4 /16
+
+_inet_pton = socket.inet_pton
+_AF_INET = socket.AF_INET
+_unpack_v4 = struct.Struct('!I').unpack
+
+
+def parse_ip(ip: str) -> Tuple[int, int]:
+    """Parse an address into ``(version, integer)``; IPv4-mapped IPv6 maps to IPv4
+
+    Raises ``ValueError`` for anything that is not a plain IPv4/IPv6 address.
+    """
+    try:
+        if ':' not in ip:
+            return 4, int.from_bytes(socket.inet_pton(socket.AF_INET, ip), 'big')
+        value = int.from_bytes(socket.inet_pton(socket.AF_INET6, ip), 'big')
+    except (OSError, TypeError):
+        raise ValueError(f"Invalid IP address {ip!r}") from None
+    if value >> 32 == 0xFFFF:
+        return 4, value & 0xFFFFFFFF
+    return 6, value
+
+
+def parse_cidr(cidr: str) -> Tuple[int, int, int]:
+    """Parse ``addr[/prefix]`` into ``(version, first, last)`` integers"""
+    address, _, prefix = cidr.strip().partition('/')
+    version, value = parse_ip(address)
+    max_prefix = 128 if ':' in address else 32
+    length = int(prefix) if prefix else max_prefix
+    if not 0 <= length <= max_prefix:
+        raise ValueError(f"Invalid prefix length in {cidr!r}")
+    if version == 4 and max_prefix == 128:
+        # IPv4-mapped IPv6 block (::ffff:a.b.c.d/n) indexes as IPv4
+        if length < 96:
+            raise ValueError(f"IPv4-mapped block {cidr!r} is wider than ::ffff:0:0/96")
+        length -= 96
+    host_bits = (32 if version == 4 else 128) - length
+    first = value & ~((1 << host_bits) - 1)
+    return version, first, first | ((1 << host_bits) - 1)
+
+
+def flatten_ranges(ranges: Iterable[Tuple[int, int, int]]) -> Tuple[List[int], List[int], List[int]]:
+    """Turn ``(first, last, label_id)`` ranges into sorted disjoint intervals
+
+    Returns parallel ``firsts``, ``lasts`` and ``labels`` lists. Nested ranges
+    override their parents (most specific wins); a repeated identical range
+    keeps the last label. Adjacent intervals with the same label are merged.
+    """
+    ordered = sorted((first, -last, seq, label) for seq, (first, last, label) in enumerate(ranges))
+    firsts: List[int] = []
+    lasts: List[int] = []
+    labels: List[int] = []
+
+    def emit(first: int, last: int, label: int) -> None:
+        if first > last:
+            return
+        if lasts and lasts[-1] + 1 == first and labels[-1] == label:
+            lasts[-1] = last
+        else:
+            firsts.append(first)
+            lasts.append(last)
+            labels.append(label)
+
+    stack: List[Tuple[int, int]] = []  # (last, label) of currently open ranges
+    cursor = 0
+    for first, negative_last, _, label in ordered:
+        while stack and stack[-1][0] < first:
+            end, open_label = stack.pop()
+            if cursor <= end:
+                emit(cursor, end, open_label)
+                cursor = end + 1
+        if stack:
+            emit(cursor, first - 1, stack[-1][1])
+        stack.append((-negative_last, label))
+        cursor = first
+    while stack:
+        end, open_label = stack.pop()
+        if cursor <= end:
+            emit(cursor, end, open_label)
+            cursor = end + 1
+
+    return firsts, lasts, labels
+
+
+class IPRangeIndex:
+    """Immutable labelled CIDR index over IPv4 and IPv6"""
+
+    def __init__(self, entries: Iterable[Tuple[str, Optional[str]]] = ()):
+        labels: Dict[str, int] = {}
+        ranges: Dict[int, List[Tuple[int, int, int]]] = {4: [], 6: []}
+        self.skipped = 0
+
+        for cidr, label in entries:
+            try:
+                version, first, last = parse_cidr(cidr)
+            except ValueError:
+                self.skipped += 1
+                continue
+            label_id = labels.setdefault(label or '', len(labels))
+            ranges[version].append((first, last, label_id))
+
+        self.labels: List[str] = list(labels)
+        self.cidr_count = len(ranges[4]) + len(ranges[6])
+
+        firsts, lasts, label_ids = flatten_ranges(ranges[4])
+        self._v4_first = array('I', firsts)
+        self._v4_last = array('I', lasts)
+        self._v4_label = array('I', label_ids)
+        # _v4_bucket[p] = number of intervals starting before /16 block p, so a
+        # lookup bisects only the few intervals overlapping its /16
+        self._v4_bucket = array('I', [0]) * (V4_BUCKETS + 1)
+        i = 0
+        for p in range(1, V4_BUCKETS + 1):
+            bound = p << 16
+            while i < len(firsts) and firsts[i] < bound:
+                i += 1
+            self._v4_bucket[p] = i
+
+        self._v6_first, self._v6_last, label_ids = flatten_ranges(ranges[6])
+        self._v6_label = array('I', label_ids)
+
+    @classmethod
+    def from_cidrs(cls, cidrs: Iterable[str], label: str = '') -> 'IPRangeIndex':
+        """Index a plain list of CIDRs under one label"""
+        return cls((cidr, label) for cidr in cidrs)
+
+    @classmethod
+    def from_files(cls, paths: Sequence[str], extra: Iterable[Tuple[str, Optional[str]]] = (),
+                   default_label: str = '') -> 'IPRangeIndex':
+        """Index ``extra`` entries plus every range file in ``paths``"""
+        def entries():
+            yield from extra
+            for path in paths:
+                yield from read_range_file(path, default_label)
+        return cls(entries())
+
+    def lookup(self, ip: str) -> Optional[str]:
+        """Label of the most specific range containing ``ip``, or None"""
+        try:
+            if ':' not in ip:
+                value = _unpack_v4(_inet_pton(_AF_INET, ip))[0]
+            else:
+                version, value = parse_ip(ip)
+                if version == 6:
+                    i = bisect_right(self._v6_first, value) - 1
+                    if i >= 0 and value <= self._v6_last[i]:
+                        return self.labels[self._v6_label[i]]
+                    return None
+        except (OSError, TypeError, ValueError):
+            return None
+
+        bucket = value >> 16
+        lo = self._v4_bucket[bucket]
+        i = bisect_right(self._v4_first, value, lo - 1 if lo else 0, self._v4_bucket[bucket + 1]) - 1
+        if i >= 0 and value <= self._v4_last[i]:
+            return self.labels[self._v4_label[i]]
+        return None
+
+    def __contains__(self, ip: str) -> bool:
+        return self.lookup(ip) is not None
+
+    def __len__(self) -> int:
+        return len(self._v4_first) + len(self._v6_first)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            'cidrs': self.cidr_count,
+            'skipped': self.skipped,
+            'ipv4_intervals': len(self._v4_first),
+            'ipv6_intervals': len(self._v6_first),
+            'labels': len(self.labels),
+        }
+
+
+def read_range_file(path: str, default_label: str = '') -> Iterable[Tuple[str, str]]:
+    """Yield ``(cidr, label)`` pairs from a range file"""
+    with open(path, 'r', encoding='utf-8') as handle:
+        for line in handle:
+            line = line.split('#', 1)[0].strip()
+            if not line:
+                continue
+            parts = line.replace(',', ' ').split(None, 1)
+            yield parts[0], parts[1].strip() if len(parts) > 1 else default_label
+
+
+class IPClassifier:
+    """Internal-range and blocklist lookups with atomic reload"""
+
+    def __init__(self, internal_paths: Sequence[str] = (), blocklist_paths: Sequence[str] = ()):
+        self.internal_paths = list(internal_paths)
+        self.blocklist_paths = list(blocklist_paths)
+        self._reload_lock = threading.Lock()
+        self._indexes = (
+            IPRangeIndex.from_cidrs(DEFAULT_INTERNAL_RANGES, 'internal'),
+            IPRangeIndex(),
+        )
+        self.reloads = 0
+
+    def reload(self) -> Dict[str, Any]:
+        """Rebuild both indexes from their files and swap them in"""
+        with self._reload_lock:
+            internal = IPRangeIndex.from_files(
+                self.internal_paths,
+                extra=((cidr, 'internal') for cidr in DEFAULT_INTERNAL_RANGES),
+                default_label='internal'
+            )
+            blocklist = IPRangeIndex.from_files(self.blocklist_paths, default_label='blocklist')
+            self._indexes = (internal, blocklist)
+            self.reloads += 1
+        logger.info(f"IP indexes loaded: internal={internal.stats()} blocklist={blocklist.stats()}")
+        return self.stats()
+
+    def is_internal(self, ip: str) -> bool:
+        return self._indexes[0].lookup(ip) is not None
+
+    def blocklist_label(self, ip: str) -> Optional[str]:
+        """Blocklist label for ``ip`` (e.g. ``botnet``), or None if not listed"""
+        return self._indexes[1].lookup(ip)
+
+    def stats(self) -> Dict[str, Any]:
+        internal, blocklist = self._indexes
+        return {'internal': internal.stats(), 'blocklist': blocklist.stats(), 'reloads': self.reloads}
+
+
+_classifier: Optional[IPClassifier] = None
+_classifier_lock = threading.Lock()
+
+
+def _paths(setting: Optional[str]) -> List[str]:
+    return [path.strip() for path in (setting or '').split(',') if path.strip()]
+
+
+def get_ip_classifier() -> IPClassifier:
+    """Process-wide classifier configured from ``IP_INTERNAL_RANGES_PATH`` / ``IP_BLOCKLIST_PATH``"""
+    global _classifier
+    if _classifier is None:
+        with _classifier_lock:
+            if _classifier is None:
+                from backend.app.core.config import settings
+                from backend.app.core.metrics import register_metrics_source
+
+                classifier = IPClassifier(_paths(settings.IP_INTERNAL_RANGES_PATH),
+                                          _paths(settings.IP_BLOCKLIST_PATH))
+                if classifier.internal_paths or classifier.blocklist_paths:
+                    try:
+                        classifier.reload()
+                    except OSError as e:
+                        logger.warning(f"Could not load IP range files: {e}")
+                register_metrics_source('ip_index', classifier.stats)
+                _classifier = classifier
+    return _classifier
@@ -1,41 +1,79 @@
 """Cybersecurity & Risk Service - Intrusion Detection, Anomaly Detection"""
 
-from typing import Dict, List, Any
-from datetime import datetime
+from typing import Dict, List, Any, Optional
+from datetime import datetime, timezone
+
+from .ip_index import get_ip_classifier
 
 
 class IntrusionDetectionSystem:
     """Detect potential intrusions"""
     
+    SUSPICIOUS_PORTS = [22, 23, 3389, 445]
+    LARGE_TRANSFER_BYTES = 1000000  # > 1MB
+    
     @staticmethod
-    def analyze_network_traffic(traffic_data: Dict[str, Any]) -> Dict[str, Any]:
+    def is_internal_ip(ip: str) -> bool:
+        """Whether an address belongs to an internal range (RFC 1918, loopback, ULA, ...)"""
+        return get_ip_classifier().is_internal(ip)
+    
+    @staticmethod
+    def blocklist_match(ip: str) -> Optional[str]:
+        """Blocklist label for an address, or None if it is not listed"""
+        return get_ip_classifier().blocklist_label(ip)
+    
+    @staticmethod
+    def event_hour(traffic_data: Dict[str, Any]) -> int:
+        """UTC hour of the event's own timestamp (epoch seconds or ISO 8601), else now"""
+        timestamp = traffic_data.get('timestamp')
+        if timestamp is None:
+            return datetime.now().hour
+        if isinstance(timestamp, (int, float)):
+            return datetime.fromtimestamp(timestamp, tz=timezone.utc).hour
+        if isinstance(timestamp, str):
+            timestamp = datetime.fromisoformat(timestamp.replace('Z', '+00:00'))
+        if timestamp.tzinfo is not None:
+            timestamp = timestamp.astimezone(timezone.utc)
+        return timestamp.hour
+    
+    @staticmethod
+    def severity_for_score(threat_score: float) -> str:
+        """Map a threat score to a severity label"""
+        return 'critical' if threat_score >= 0.8 else 'high' if threat_score >= 0.5 else 'medium' if threat_score >= 0.3 else 'low'
+    
+    @classmethod
+    def analyze_network_traffic(cls, traffic_data: Dict[str, Any]) -> Dict[str, Any]:
         """Analyze network traffic for intrusions"""
         threat_score = 0.0
         threats = []
         
         # Check for suspicious IPs
         source_ip = traffic_data.get('source_ip', '')
-        if source_ip.startswith('192.168.') or source_ip.startswith('10.'):
+        if cls.is_internal_ip(source_ip):
             # Internal IP - less suspicious
             threat_score += 0.0
         else:
             threat_score += 0.2
         
+        listed = cls.blocklist_match(source_ip)
+        if listed is not None:
+            threat_score += 0.5
+            threats.append(f'Source IP on blocklist ({listed})')
+        
         # Check traffic volume
         bytes_transferred = traffic_data.get('bytes', 0)
-        if bytes_transferred > 1000000:  # > 1MB
+        if bytes_transferred > cls.LARGE_TRANSFER_BYTES:
             threat_score += 0.3
             threats.append('Large data transfer detected')
         
         # Check port
         port = traffic_data.get('port', 80)
-        suspicious_ports = [22, 23, 3389, 445]
-        if port in suspicious_ports:
+        if port in cls.SUSPICIOUS_PORTS:
             threat_score += 0.2
             threats.append(f'Access to sensitive port {port}')
         
-        # Time-based analysis
-        hour = datetime.now().hour
+        # Time-based analysis (event time, so replayed logs are judged correctly)
+        hour = cls.event_hour(traffic_data)
         if hour < 6 or hour > 22:
             threat_score += 0.15
             threats.append('Off-hours activity')
@@ -45,7 +83,7 @@ class IntrusionDetectionSystem:
         return {
             'is_threat': is_threat,
             'threat_score': round(threat_score, 2),
-            'severity': 'critical' if threat_score >= 0.8 else 'high' if threat_score >= 0.5 else 'medium' if threat_score >= 0.3 else 'low',
+            'severity': cls.severity_for_score(threat_score),
             'detected_threats': threats if threats else ['No threats detected']
         }
 
@@ -78,6 +116,31 @@ class AnomalyDetector:
             'detected_anomalies': anomalies if anomalies else ['No anomalies detected'],
             'recommendation': 'Investigate immediately' if anomaly_score >= 0.7 else 'Monitor closely' if anomaly_score >= 0.4 else 'Normal operation'
         }
+    
+    @staticmethod
+    def detect_with_baselines(metrics: Dict[str, float], prefix: str = 'security') -> Dict[str, Any]:
+        """Detect anomalies against learned rolling baselines, then update them"""
+        from backend.app.ml.baselines import get_baseline_engine
+        
+        names = list(metrics)
+        result = get_baseline_engine().ingest([f"{prefix}.{name}" for name in names], [metrics[name] for name in names])
+        anomalies = []
+        anomaly_score = 0.0
+        
+        for name, expected, z, flagged in zip(names, result['expected'].tolist(),
+                                              result['z_score'].tolist(), result['anomalous'].tolist()):
+            if flagged:
+                anomalies.append(f"{name}: {metrics[name]} (baseline: {round(expected, 2)}, z={z:.1f})")
+                anomaly_score += 0.4
+            elif abs(z) >= 2.0:
+                anomaly_score += 0.1
+        
+        return {
+            'is_anomalous': anomaly_score >= 0.4,
+            'anomaly_score': round(min(1.0, anomaly_score), 2),
+            'detected_anomalies': anomalies if anomalies else ['No anomalies detected'],
+            'recommendation': 'Investigate immediately' if anomaly_score >= 0.7 else 'Monitor closely' if anomaly_score >= 0.4 else 'Normal operation'
+        }
 
 
 class ComplianceMonitor:
@@ -90,32 +153,41 @@ class ComplianceMonitor:
         'encryption_required': True
     }
     
-    @staticmethod
-    def check_compliance(system_config: Dict[str, Any]) -> Dict[str, Any]:
+    # Score deducted per violated policy
+    PENALTIES = {
+        'password_strength': 15,
+        'mfa_required': 25,
+        'encryption_required': 20,
+        'access_review_days': 10
+    }
+    
+    @classmethod
+    def check_compliance(cls, system_config: Dict[str, Any]) -> Dict[str, Any]:
         """Check compliance with policies"""
         violations = []
         compliance_score = 100
         
         # Password policy
-        if system_config.get('password_min_length', 0) < 12:
+        if system_config.get('password_min_length', 0) < cls.POLICIES['password_strength']['min_length']:
             violations.append('Password minimum length below policy')
-            compliance_score -= 15
+            compliance_score -= cls.PENALTIES['password_strength']
         
         # MFA
-        if not system_config.get('mfa_enabled', False):
+        if cls.POLICIES['mfa_required'] and not system_config.get('mfa_enabled', False):
             violations.append('Multi-factor authentication not enabled')
-            compliance_score -= 25
+            compliance_score -= cls.PENALTIES['mfa_required']
         
         # Encryption
-        if not system_config.get('encryption_at_rest', False):
+        if cls.POLICIES['encryption_required'] and not system_config.get('encryption_at_rest', False):
             violations.append('Data encryption at rest not enabled')
-            compliance_score -= 20
+            compliance_score -= cls.PENALTIES['encryption_required']
         
         # Access review
+        review_days = cls.POLICIES['access_review_days']
         days_since_review = system_config.get('days_since_access_review', 0)
-        if days_since_review > 90:
-            violations.append(f'Access review overdue by {days_since_review - 90} days')
-            compliance_score -= 10
+        if days_since_review > review_days:
+            violations.append(f'Access review overdue by {days_since_review - review_days} days')
+            compliance_score -= cls.PENALTIES['access_review_days']
         
         return {
             'is_compliant': len(violations) == 0,
@@ -127,8 +199,17 @@ class ComplianceMonitor:
 
 def analyze_security_alert(alert_data: Dict[str, Any]) -> Dict[str, Any]:
     """Analyze security alert"""
+    return analyze_security_alerts([alert_data])[0]
+
+
+def analyze_security_alerts(alerts: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Analyze a batch of security alerts"""
     ids = IntrusionDetectionSystem()
-    
+    return [_analyze_alert(ids, alert_data) for alert_data in alerts]
+
+
+def _analyze_alert(ids: IntrusionDetectionSystem, alert_data: Dict[str, Any]) -> Dict[str, Any]:
+    """Threat assessment for a single alert"""
     if alert_data.get('type') == 'network':
         return ids.analyze_network_traffic(alert_data)
     
@@ -136,8 +217,16 @@ def analyze_security_alert(alert_data: Dict[str, Any]) -> Dict[str, Any]:
     severity = alert_data.get('severity', 'medium')
     threat_score = {'critical': 0.9, 'high': 0.7, 'medium': 0.5, 'low': 0.3}.get(severity, 0.5)
     
-    return {
+    result = {
         'is_threat': threat_score >= 0.5,
         'threat_score': threat_score,
         'severity': severity
     }
+    
+    listed = ids.blocklist_match(alert_data.get('source_ip') or '')
+    if listed is not None:
+        result['is_threat'] = True
+        result['threat_score'] = max(threat_score, 0.8)
+        result['blocklist_match'] = listed
+    
+    return result
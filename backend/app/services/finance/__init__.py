@@ -6,9 +6,16 @@ from .finance_service import (
     ExpenseClassifier,
     BudgetOptimizer,
     analyze_transaction,
+    analyze_transactions,
     forecast_monthly_revenue,
     optimize_department_budget
 )
+from .rollups import (
+    register_rollup_listeners,
+    rebuild_rollups,
+    get_series,
+    forecast_series
+)
 
 __all__ = [
     "FraudDetectionModel",
@@ -16,6 +23,11 @@ __all__ = [
     "ExpenseClassifier",
     "BudgetOptimizer",
     "analyze_transaction",
+    "analyze_transactions",
     "forecast_monthly_revenue",
-    "optimize_department_budget"
+    "optimize_department_budget",
+    "register_rollup_listeners",
+    "rebuild_rollups",
+    "get_series",
+    "forecast_series"
 ]
@@ -1,7 +1,5 @@
 """Finance & Accounting Service - Revenue Forecasting, Fraud Detection, Budget Optimization"""
 
-import numpy as np
-from sklearn.ensemble import IsolationForest, RandomForestRegressor
 from typing import Dict, List, Any
 from datetime import datetime, timedelta
 from backend.app.ml.base import MLModelBase
@@ -12,7 +10,19 @@ class FraudDetectionModel(MLModelBase):
     
     def __init__(self):
         super().__init__("fraud_detection", "1.0.0")
-        self.model = IsolationForest(contamination=0.1, random_state=42)
+        self._model = None
+    
+    @property
+    def model(self):
+        """Isolation forest estimator, built on first access so sklearn loads lazily"""
+        if self._model is None:
+            from sklearn.ensemble import IsolationForest
+            self._model = IsolationForest(contamination=0.1, random_state=42)
+        return self._model
+    
+    @model.setter
+    def model(self, value):
+        self._model = value
     
     def detect_fraud(self, transaction_data: Dict[str, Any]) -> Dict[str, Any]:
         """Detect if transaction is fraudulent"""
@@ -62,7 +72,7 @@ class RevenueForecasting(MLModelBase):
         """Forecast revenue for next periods"""
         if len(historical_data) < 3:
             # Not enough data, return simple average
-            avg = np.mean(historical_data) if historical_data else 0
+            avg = sum(historical_data) / len(historical_data) if historical_data else 0
             return [avg * 1.05 ** i for i in range(periods)]
         
         # Simple trend-based forecasting
@@ -143,18 +153,27 @@ class BudgetOptimizer:
 # Service functions
 def analyze_transaction(transaction_data: Dict[str, Any]) -> Dict[str, Any]:
     """Analyze a financial transaction"""
+    return analyze_transactions([transaction_data])[0]
+
+
+def analyze_transactions(transactions: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Analyze a batch of transactions with a single fraud model instance"""
     fraud_model = FraudDetectionModel()
+    results = []
     
-    # Detect fraud
-    fraud_result = fraud_model.detect_fraud(transaction_data)
-    
-    # Classify expense
-    category = ExpenseClassifier.classify(transaction_data.get('description', ''))
+    for transaction_data in transactions:
+        # Detect fraud
+        fraud_result = fraud_model.detect_fraud(transaction_data)
+        
+        # Classify expense
+        category = ExpenseClassifier.classify(transaction_data.get('description', ''))
+        
+        results.append({
+            **fraud_result,
+            'category': category
+        })
     
-    return {
-        **fraud_result,
-        'category': category
-    }
+    return results
 
 
 def forecast_monthly_revenue(historical_revenue: List[float]) -> Dict[str, Any]:
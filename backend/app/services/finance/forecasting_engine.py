@@ -0,0 +1,194 @@
+"""Multi-series revenue forecasting engine
+
+Fits linear trend, Holt (additive trend exponential smoothing) and seasonal
+naive models across a 2-D array of series at once. Every model is vectorized
+over the series axis, so the only Python loop is over time steps in Holt's
+recursion. Prediction intervals come from each model's in-sample residual
+variance and the model's h-step variance formula.
+"""
+
+from statistics import NormalDist
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from backend.app.core.parallel import concat_shard_results, map_row_shards
+
+METHODS = ('linear', 'holt', 'seasonal_naive')
+
+# Smoothing parameter grid searched per series for Holt's method
+HOLT_ALPHAS = (0.2, 0.4, 0.6, 0.8)
+HOLT_BETAS = (0.05, 0.1, 0.2)
+
+
+def _z(level: float) -> float:
+    """Two-sided standard normal quantile for a coverage level"""
+    return NormalDist().inv_cdf(0.5 + level / 2)
+
+
+def linear_trend(Y: np.ndarray, horizon: int, level: float = 0.95) -> Dict[str, np.ndarray]:
+    """OLS linear trend per series with standard prediction intervals"""
+    n_series, n = Y.shape
+    t = np.arange(n, dtype=np.float64)
+    t_mean = t.mean()
+    sxx = ((t - t_mean) ** 2).sum()
+
+    y_mean = Y.mean(axis=1, keepdims=True)
+    slope = (Y - y_mean) @ (t - t_mean) / sxx
+    intercept = y_mean[:, 0] - slope * t_mean
+
+    fitted = intercept[:, None] + slope[:, None] * t
+    dof = max(n - 2, 1)
+    sigma = np.sqrt(((Y - fitted) ** 2).sum(axis=1) / dof)
+
+    t_future = np.arange(n, n + horizon, dtype=np.float64)
+    forecast = intercept[:, None] + slope[:, None] * t_future
+    se = sigma[:, None] * np.sqrt(1 + 1 / n + (t_future - t_mean) ** 2 / sxx)
+
+    return _with_interval(forecast, se, level, sigma)
+
+
+def holt(Y: np.ndarray, horizon: int, level: float = 0.95) -> Dict[str, np.ndarray]:
+    """Holt's linear method with per-series (alpha, beta) chosen by one-step SSE
+
+    All grid combinations are run simultaneously as a (grid, series) array.
+    """
+    n_series, n = Y.shape
+    grid = np.array([(a, b) for a in HOLT_ALPHAS for b in HOLT_BETAS])
+    alpha = grid[:, 0:1]
+    beta = grid[:, 1:2]
+
+    level_ = np.broadcast_to(Y[:, 0], (len(grid), n_series)).copy()
+    trend = np.broadcast_to(Y[:, 1] - Y[:, 0], (len(grid), n_series)).copy()
+    sse = np.zeros((len(grid), n_series))
+
+    for step in range(1, n):
+        y = Y[:, step]
+        prediction = level_ + trend
+        error = y - prediction
+        sse += error ** 2
+        new_level = prediction + alpha * error
+        trend = trend + alpha * beta * error
+        level_ = new_level
+
+    best = sse.argmin(axis=0)
+    cols = np.arange(n_series)
+    alpha_best = grid[best, 0]
+    beta_best = grid[best, 1]
+    sigma = np.sqrt(sse[best, cols] / max(n - 1, 1))
+
+    h = np.arange(1, horizon + 1, dtype=np.float64)
+    forecast = level_[best, cols][:, None] + h * trend[best, cols][:, None]
+
+    # ETS(A,A,N) variance: sigma^2 * (1 + sum_{j<h} (alpha * (1 + beta * j))^2)
+    j = np.arange(horizon, dtype=np.float64)
+    c = (alpha_best[:, None] * (1 + beta_best[:, None] * j)) ** 2
+    c[:, 0] = 0.0
+    se = sigma[:, None] * np.sqrt(1 + np.cumsum(c, axis=1))
+
+    result = _with_interval(forecast, se, level, sigma)
+    result['alpha'] = alpha_best
+    result['beta'] = beta_best
+    return result
+
+
+def seasonal_naive(Y: np.ndarray, horizon: int, level: float = 0.95,
+                   season_length: int = 12) -> Dict[str, np.ndarray]:
+    """Repeat the last observed season; intervals widen once per full season"""
+    n_series, n = Y.shape
+    if n <= season_length:
+        raise ValueError(f"seasonal_naive needs more than {season_length} observations per series")
+
+    last_season = Y[:, n - season_length:]
+    h = np.arange(horizon)
+    forecast = last_season[:, h % season_length]
+
+    residuals = Y[:, season_length:] - Y[:, :-season_length]
+    sigma = np.sqrt((residuals ** 2).mean(axis=1))
+    se = sigma[:, None] * np.sqrt(h // season_length + 1)
+
+    return _with_interval(forecast, se, level, sigma)
+
+
+def _with_interval(forecast: np.ndarray, se: np.ndarray, level: float, sigma: np.ndarray) -> Dict[str, np.ndarray]:
+    z = _z(level)
+    return {
+        'forecast': forecast,
+        'lower': forecast - z * se,
+        'upper': forecast + z * se,
+        'sigma': sigma,
+    }
+
+
+def _forecast_shard(Y: np.ndarray, method: str, horizon: int, level: float, season_length: int) -> Dict[str, np.ndarray]:
+    """Module-level shard worker so it can run in a process pool"""
+    if method == 'linear':
+        return linear_trend(Y, horizon, level)
+    if method == 'holt':
+        return holt(Y, horizon, level)
+    return seasonal_naive(Y, horizon, level, season_length)
+
+
+class MultiSeriesForecaster:
+    """Forecast many equal-length series at once"""
+
+    def __init__(self, method: str = 'holt', level: float = 0.95, season_length: int = 12,
+                 n_jobs: Optional[int] = 1, min_series_per_shard: int = 2000):
+        if method not in METHODS:
+            raise ValueError(f"Unknown method {method!r}; expected one of {METHODS}")
+        if not 0 < level < 1:
+            raise ValueError("level must be between 0 and 1")
+        self.method = method
+        self.level = level
+        self.season_length = season_length
+        self.n_jobs = n_jobs
+        self.min_series_per_shard = min_series_per_shard
+
+    def forecast(self, Y: Any, horizon: int = 3) -> Dict[str, np.ndarray]:
+        """Forecast ``horizon`` steps for every row of ``Y`` (series x time)"""
+        Y = np.asarray(Y, dtype=np.float64)
+        if Y.ndim == 1:
+            Y = Y[None, :]
+        if Y.ndim != 2 or Y.shape[1] < 2:
+            raise ValueError("Y must be a 2-D array with at least 2 observations per series")
+        if not np.isfinite(Y).all():
+            raise ValueError("Y must not contain NaN or infinite values")
+        if horizon < 1:
+            raise ValueError("horizon must be at least 1")
+
+        results = map_row_shards(
+            _forecast_shard, Y, n_jobs=self.n_jobs, min_rows_per_shard=self.min_series_per_shard,
+            method=self.method, horizon=horizon, level=self.level, season_length=self.season_length
+        )
+        return concat_shard_results(results)
+
+
+def forecast_revenue_series(series: Dict[str, List[float]], horizon: int = 3, method: str = 'holt',
+                            level: float = 0.95, season_length: int = 12, n_jobs: Optional[int] = 1) -> Dict[str, Any]:
+    """Forecast a named collection of revenue series
+
+    Series are grouped by length so each group is forecast as one 2-D array.
+    """
+    forecaster = MultiSeriesForecaster(method=method, level=level, season_length=season_length, n_jobs=n_jobs)
+
+    by_length: Dict[int, List[str]] = {}
+    for name, values in series.items():
+        by_length.setdefault(len(values), []).append(name)
+
+    forecasts = {}
+    for names in by_length.values():
+        result = forecaster.forecast([series[name] for name in names], horizon=horizon)
+        for i, name in enumerate(names):
+            forecasts[name] = {
+                'forecast': np.round(result['forecast'][i], 2).tolist(),
+                'lower': np.round(result['lower'][i], 2).tolist(),
+                'upper': np.round(result['upper'][i], 2).tolist(),
+            }
+
+    return {
+        'method': method,
+        'horizon': horizon,
+        'level': level,
+        'series_count': len(forecasts),
+        'forecasts': forecasts,
+    }
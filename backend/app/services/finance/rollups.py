@@ -0,0 +1,242 @@
+"""Transaction rollups - incremental period aggregates feeding forecasts
+
+Every inserted ``Transaction`` is folded into ``transaction_rollups`` rows for
+its day, week (Monday start) and month, keyed by transaction type and
+category. Revenue and expense series for any slice are then read from the
+rollups instead of scanning raw transactions.
+
+Series IDs have the form ``<period>:<transaction_type>[:<category>]``, e.g.
+``month:income`` or ``week:expense:technology``.
+"""
+
+import logging
+from datetime import date, datetime, timedelta
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import event, func, select, update
+from sqlalchemy.engine import Connection
+from sqlalchemy.orm import Session
+
+from backend.app.models.models import Transaction, TransactionRollup
+
+logger = logging.getLogger(__name__)
+
+PERIODS = ('day', 'week', 'month')
+
+_rollups = TransactionRollup.__table__
+RollupKey = Tuple[str, datetime, str, str]
+
+
+def period_start(period: str, value: datetime) -> datetime:
+    """Start of the day/week/month containing ``value`` (naive, midnight)"""
+    day = value.date() if isinstance(value, datetime) else value
+    if period == 'week':
+        day = day - timedelta(days=day.weekday())
+    elif period == 'month':
+        day = day.replace(day=1)
+    elif period != 'day':
+        raise ValueError(f"Unknown period {period!r}; expected one of {PERIODS}")
+    return datetime(day.year, day.month, day.day)
+
+
+def next_period(period: str, start: datetime) -> datetime:
+    """Start of the period following ``start``"""
+    if period == 'day':
+        return start + timedelta(days=1)
+    if period == 'week':
+        return start + timedelta(days=7)
+    if start.month == 12:
+        return start.replace(year=start.year + 1, month=1)
+    return start.replace(month=start.month + 1)
+
+
+def accumulate(rows: Iterable[Dict[str, Any]]) -> Dict[RollupKey, List[float]]:
+    """Fold transaction dicts into ``{rollup key: [total, count]}``"""
+    totals: Dict[RollupKey, List[float]] = {}
+    for row in rows:
+        when = row.get('date')
+        if when is None:
+            continue
+        transaction_type = row.get('transaction_type') or 'unknown'
+        category = row.get('category') or ''
+        amount = row.get('amount') or 0.0
+        for period in PERIODS:
+            key = (period, period_start(period, when), transaction_type, category)
+            entry = totals.setdefault(key, [0.0, 0])
+            entry[0] += amount
+            entry[1] += 1
+    return totals
+
+
+def apply_to_rollups(connection: Connection, totals: Dict[RollupKey, List[float]]) -> None:
+    """Add accumulated totals to the rollup table (upsert)
+
+    Uses ``INSERT ... ON CONFLICT DO UPDATE`` on SQLite and PostgreSQL and an
+    update-then-insert fallback elsewhere.
+    """
+    if not totals:
+        return
+
+    values = [
+        {'period': period, 'period_start': start, 'transaction_type': transaction_type,
+         'category': category, 'total_amount': total, 'transaction_count': count}
+        for (period, start, transaction_type, category), (total, count) in totals.items()
+    ]
+
+    dialect = connection.dialect.name
+    if dialect in ('sqlite', 'postgresql'):
+        if dialect == 'sqlite':
+            from sqlalchemy.dialects.sqlite import insert as dialect_insert
+        else:
+            from sqlalchemy.dialects.postgresql import insert as dialect_insert
+        stmt = dialect_insert(_rollups)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=['period', 'period_start', 'transaction_type', 'category'],
+            set_={
+                'total_amount': _rollups.c.total_amount + stmt.excluded.total_amount,
+                'transaction_count': _rollups.c.transaction_count + stmt.excluded.transaction_count,
+                'updated_at': func.now(),
+            }
+        )
+        connection.execute(stmt, values)
+        return
+
+    for value in values:
+        result = connection.execute(
+            update(_rollups)
+            .where(_rollups.c.period == value['period'])
+            .where(_rollups.c.period_start == value['period_start'])
+            .where(_rollups.c.transaction_type == value['transaction_type'])
+            .where(_rollups.c.category == value['category'])
+            .values(
+                total_amount=_rollups.c.total_amount + value['total_amount'],
+                transaction_count=_rollups.c.transaction_count + value['transaction_count'],
+            )
+        )
+        if result.rowcount == 0:
+            connection.execute(_rollups.insert(), value)
+
+
+def _after_transaction_insert(mapper, connection, target) -> None:
+    """ORM hook: fold each flushed transaction into the rollups"""
+    apply_to_rollups(connection, accumulate([{
+        'date': target.date,
+        'transaction_type': target.transaction_type,
+        'category': target.category,
+        'amount': target.amount,
+    }]))
+
+
+def register_rollup_listeners() -> None:
+    """Keep rollups current for ORM inserts (idempotent)
+
+    Core bulk inserts bypass mapper events; callers doing ``insert(Transaction)``
+    with many rows should call ``apply_to_rollups(connection, accumulate(rows))``.
+    """
+    if not event.contains(Transaction, 'after_insert', _after_transaction_insert):
+        event.listen(Transaction, 'after_insert', _after_transaction_insert)
+
+
+def rebuild_rollups(db: Session, chunk_size: int = 10_000) -> Dict[str, int]:
+    """Recompute every rollup from the raw transactions table"""
+    db.execute(_rollups.delete())
+    processed = 0
+    last_id = 0
+
+    while True:
+        rows = db.execute(
+            select(Transaction.id, Transaction.date, Transaction.transaction_type,
+                   Transaction.category, Transaction.amount)
+            .where(Transaction.id > last_id)
+            .order_by(Transaction.id)
+            .limit(chunk_size)
+        ).mappings().all()
+        if not rows:
+            break
+        apply_to_rollups(db.connection(), accumulate(rows))
+        processed += len(rows)
+        last_id = rows[-1]['id']
+
+    db.commit()
+    rollup_rows = db.query(func.count(TransactionRollup.id)).scalar()
+    return {'transactions_processed': processed, 'rollup_rows': rollup_rows}
+
+
+def parse_series_id(series_id: str) -> Tuple[str, str, Optional[str]]:
+    """Split ``period:type[:category]`` into its parts"""
+    parts = series_id.split(':', 2)
+    if len(parts) < 2 or parts[0] not in PERIODS or not parts[1]:
+        raise ValueError(f"Invalid series id {series_id!r}; expected <period>:<transaction_type>[:<category>]")
+    return parts[0], parts[1], parts[2] if len(parts) == 3 else None
+
+
+def get_series(db: Session, series_id: str, start: Optional[date] = None,
+               end: Optional[date] = None) -> Dict[str, Any]:
+    """Read a contiguous (zero-filled) period series for a slice from the rollups"""
+    period, transaction_type, category = parse_series_id(series_id)
+
+    query = (
+        select(TransactionRollup.period_start,
+               func.sum(TransactionRollup.total_amount),
+               func.sum(TransactionRollup.transaction_count))
+        .where(TransactionRollup.period == period)
+        .where(TransactionRollup.transaction_type == transaction_type)
+        .group_by(TransactionRollup.period_start)
+        .order_by(TransactionRollup.period_start)
+    )
+    if category is not None:
+        query = query.where(TransactionRollup.category == category)
+    if start is not None:
+        query = query.where(TransactionRollup.period_start >= period_start(period, start))
+    if end is not None:
+        query = query.where(TransactionRollup.period_start <= period_start(period, end))
+
+    rows = db.execute(query).all()
+    points = []
+    if rows:
+        by_start = {row[0]: (row[1], row[2]) for row in rows}
+        cursor, last = rows[0][0], rows[-1][0]
+        while cursor <= last:
+            total, count = by_start.get(cursor, (0.0, 0))
+            points.append({'period_start': cursor.date().isoformat(),
+                           'total_amount': round(total, 2), 'transaction_count': int(count)})
+            cursor = next_period(period, cursor)
+
+    return {
+        'series_id': series_id,
+        'period': period,
+        'transaction_type': transaction_type,
+        'category': category,
+        'points': points,
+    }
+
+
+def forecast_series(db: Session, series_id: str, horizon: int = 3, method: str = 'holt',
+                    level: float = 0.95) -> Dict[str, Any]:
+    """Forecast a rollup-backed series by ID"""
+    from .forecasting_engine import MultiSeriesForecaster
+
+    series = get_series(db, series_id)
+    values = [point['total_amount'] for point in series['points']]
+    if len(values) < 3:
+        raise ValueError(f"Series {series_id!r} has {len(values)} periods; at least 3 are needed")
+
+    result = MultiSeriesForecaster(method=method, level=level).forecast([values], horizon=horizon)
+
+    starts = []
+    cursor = datetime.fromisoformat(series['points'][-1]['period_start'])
+    for _ in range(horizon):
+        cursor = next_period(series['period'], cursor)
+        starts.append(cursor.date().isoformat())
+
+    return {
+        'series_id': series_id,
+        'method': method,
+        'level': level,
+        'history': series['points'],
+        'forecast': [
+            {'period_start': start, 'forecast': round(float(f), 2),
+             'lower': round(float(lo), 2), 'upper': round(float(hi), 2)}
+            for start, f, lo, hi in zip(starts, result['forecast'][0], result['lower'][0], result['upper'][0])
+        ],
+    }
@@ -5,6 +5,7 @@ from .hr_service import (
     EmployeeRetentionModel,
     PerformanceAnalytics,
     screen_resume,
+    screen_resumes,
     analyze_employee_retention
 )
 
@@ -13,5 +14,6 @@ __all__ = [
     "EmployeeRetentionModel", 
     "PerformanceAnalytics",
     "screen_resume",
+    "screen_resumes",
     "analyze_employee_retention"
 ]
@@ -1,8 +1,5 @@
 """HR Tech Service - Resume Screening, Performance Analytics, Retention Modeling"""
 
-import numpy as np
-from sklearn.ensemble import RandomForestClassifier
-from sklearn.feature_extraction.text import TfidfVectorizer
 from typing import Dict, List, Any
 from backend.app.ml.base import MLModelBase
 
@@ -12,7 +9,15 @@ class ResumeScreeningModel(MLModelBase):
     
     def __init__(self):
         super().__init__("resume_screening", "1.0.0")
-        self.vectorizer = TfidfVectorizer(max_features=100)
+        self._vectorizer = None
+    
+    @property
+    def vectorizer(self):
+        """TF-IDF vectorizer, built on first use so scoring never imports sklearn"""
+        if self._vectorizer is None:
+            from sklearn.feature_extraction.text import TfidfVectorizer
+            self._vectorizer = TfidfVectorizer(max_features=100)
+        return self._vectorizer
         
     def train(self, resume_texts: List[str], labels: List[int]):
         """Train resume screening model"""
@@ -144,27 +149,41 @@ class PerformanceAnalytics:
 # Service functions
 def screen_resume(resume_text: str, candidate_name: str, email: str) -> Dict[str, Any]:
     """Screen a resume and return results"""
+    return screen_resumes([{
+        'resume_text': resume_text,
+        'candidate_name': candidate_name,
+        'email': email
+    }])[0]
+
+
+def screen_resumes(resumes: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Screen a batch of resumes with a single model instance"""
     model = ResumeScreeningModel()
+    results = []
     
-    score = model.score_resume(resume_text)
-    skills = model.extract_skills(resume_text)
-    
-    # Determine status based on score
-    if score >= 70:
-        status = "shortlisted"
-    elif score >= 50:
-        status = "pending"
-    else:
-        status = "rejected"
+    for resume in resumes:
+        resume_text = resume.get('resume_text', '')
+        score = model.score_resume(resume_text)
+        skills = model.extract_skills(resume_text)
+        
+        # Determine status based on score
+        if score >= 70:
+            status = "shortlisted"
+        elif score >= 50:
+            status = "pending"
+        else:
+            status = "rejected"
+        
+        results.append({
+            'candidate_name': resume.get('candidate_name'),
+            'email': resume.get('email'),
+            'ml_score': score,
+            'skills': skills,
+            'status': status,
+            'recommendation': f"Score: {score}/100 - {status.capitalize()}"
+        })
     
-    return {
-        'candidate_name': candidate_name,
-        'email': email,
-        'ml_score': score,
-        'skills': skills,
-        'status': status,
-        'recommendation': f"Score: {score}/100 - {status.capitalize()}"
-    }
+    return results
 
 
 def analyze_employee_retention(employee_data: Dict[str, Any]) -> Dict[str, Any]:
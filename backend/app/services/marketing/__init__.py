@@ -4,12 +4,14 @@ from .marketing_service import (
     LeadScoringModel,
     CampaignOptimizer,
     SEOPredictor,
-    score_and_prioritize_lead
+    score_and_prioritize_lead,
+    score_and_prioritize_leads
 )
 
 __all__ = [
     "LeadScoringModel",
     "CampaignOptimizer",
     "SEOPredictor",
-    "score_and_prioritize_lead"
+    "score_and_prioritize_lead",
+    "score_and_prioritize_leads"
 ]
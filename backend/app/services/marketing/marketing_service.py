@@ -137,22 +137,31 @@ class SEOPredictor:
 
 def score_and_prioritize_lead(lead_data: Dict[str, Any]) -> Dict[str, Any]:
     """Score and prioritize a lead"""
+    return score_and_prioritize_leads([lead_data])[0]
+
+
+def score_and_prioritize_leads(leads: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Score and prioritize a batch of leads"""
     model = LeadScoringModel()
+    results = []
     
-    lead_score = model.score_lead(lead_data)
-    conversion_prob = model.predict_conversion_probability(lead_score)
-    
-    # Determine status
-    if lead_score >= 70:
-        status = "hot"
-    elif lead_score >= 50:
-        status = "warm"
-    else:
-        status = "cold"
+    for lead_data in leads:
+        lead_score = model.score_lead(lead_data)
+        conversion_prob = model.predict_conversion_probability(lead_score)
+        
+        # Determine status
+        if lead_score >= 70:
+            status = "hot"
+        elif lead_score >= 50:
+            status = "warm"
+        else:
+            status = "cold"
+        
+        results.append({
+            'lead_score': lead_score,
+            'conversion_probability': conversion_prob,
+            'status': status,
+            'priority': 'high' if lead_score >= 70 else 'medium' if lead_score >= 50 else 'low'
+        })
     
-    return {
-        'lead_score': lead_score,
-        'conversion_probability': conversion_prob,
-        'status': status,
-        'priority': 'high' if lead_score >= 70 else 'medium' if lead_score >= 50 else 'low'
-    }
+    return results
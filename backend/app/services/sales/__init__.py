@@ -4,12 +4,19 @@ from .sales_service import (
     ChurnPredictionModel,
     CustomerLifetimeValueModel,
     DealForecasting,
-    analyze_customer_health
+    analyze_customer_health,
+    analyze_customer_health_batch
 )
+from .customer_rescoring import rescore_customers
+from .pipeline_forecasting import PipelineForecaster, forecast_pipeline
 
 __all__ = [
     "ChurnPredictionModel",
     "CustomerLifetimeValueModel",
     "DealForecasting",
-    "analyze_customer_health"
+    "PipelineForecaster",
+    "analyze_customer_health",
+    "analyze_customer_health_batch",
+    "rescore_customers",
+    "forecast_pipeline"
 ]
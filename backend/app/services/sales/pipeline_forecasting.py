@@ -0,0 +1,213 @@
+"""Pipeline-level deal forecasting
+
+Forecasts a whole pipeline of open deals held as columns. Close probabilities
+and expected close dates are computed with NumPy lookups over stage codes,
+expected value is aggregated into week, stage and owner buckets with
+``np.bincount``, and single-deal changes adjust the aggregates in place.
+"""
+
+from datetime import date, timedelta
+from typing import Any, Dict, Hashable, Optional, Sequence
+
+import numpy as np
+
+from .sales_service import DealForecasting
+
+STAGES = list(DealForecasting.STAGE_PROBABILITIES)
+UNKNOWN_STAGE = len(STAGES)  # code for stages outside the known funnel
+
+# Lookup tables indexed by stage code (last entry = unknown stage)
+STAGE_PROBABILITY = np.array(
+    [DealForecasting.STAGE_PROBABILITIES[s] for s in STAGES] + [DealForecasting.DEFAULT_PROBABILITY]
+)
+STAGE_DAYS = np.array(
+    [DealForecasting.STAGE_DAYS[s] for s in STAGES] + [DealForecasting.DEFAULT_DAYS],
+    dtype=np.int64
+)
+_STAGE_CODES = {stage: code for code, stage in enumerate(STAGES)}
+
+
+def _stage_code(stage: str) -> int:
+    return _STAGE_CODES.get(stage, UNKNOWN_STAGE)
+
+
+def close_probabilities(stage_codes: np.ndarray, days_in_pipeline: np.ndarray) -> np.ndarray:
+    """Vectorized ``DealForecasting.forecast_deal`` close probability"""
+    probability = STAGE_PROBABILITY[stage_codes]
+    return probability * np.where(days_in_pipeline > 90, 0.7, np.where(days_in_pipeline < 7, 0.9, 1.0))
+
+
+class PipelineForecaster:
+    """Expected revenue by week, stage and owner across an open pipeline
+
+    ``deals`` is a mapping of equal-length columns: ``deal_id``, ``stage``,
+    ``value``, ``days_in_pipeline`` and (optionally) ``owner``.
+    """
+
+    def __init__(self, deals: Dict[str, Sequence[Any]], as_of: Optional[date] = None, bucket_days: int = 7):
+        self.as_of = as_of or date.today()
+        self.bucket_days = max(1, bucket_days)
+        self.n_weeks = int(STAGE_DAYS.max()) // self.bucket_days + 1
+
+        deal_ids = list(deals.get('deal_id', []))
+        n = len(deal_ids)
+        owners = list(deals.get('owner') or ['unassigned'] * n)
+
+        self._index: Dict[Hashable, int] = {deal_id: i for i, deal_id in enumerate(deal_ids)}
+        if len(self._index) != n:
+            raise ValueError("deal_id values must be unique")
+
+        self._owner_names = list(dict.fromkeys(owners))
+        self._owner_codes = {owner: code for code, owner in enumerate(self._owner_names)}
+
+        self._size = n
+        self.stage = np.fromiter((_stage_code(s) for s in deals.get('stage', [])), dtype=np.int64, count=n)
+        self.value = np.asarray(deals.get('value', []), dtype=np.float64).reshape(n)
+        self.days_in_pipeline = np.asarray(deals.get('days_in_pipeline', [0] * n), dtype=np.float64).reshape(n)
+        self.owner = np.fromiter((self._owner_codes[o] for o in owners), dtype=np.int64, count=n)
+        self.active = np.ones(n, dtype=bool)
+
+        self.recompute()
+
+    def recompute(self) -> None:
+        """Full vectorized recomputation of every deal and aggregate"""
+        n = self._size
+        active = self.active[:n]
+        self.probability = close_probabilities(self.stage[:n], self.days_in_pipeline[:n])
+        self.expected_value = np.where(active, self.value[:n] * self.probability, 0.0)
+        self.week = STAGE_DAYS[self.stage[:n]] // self.bucket_days
+
+        counts = active.astype(np.float64)
+        self.by_week = np.bincount(self.week, weights=self.expected_value, minlength=self.n_weeks)
+        self.by_stage = np.bincount(self.stage[:n], weights=self.expected_value, minlength=len(STAGES) + 1)
+        self.by_owner = np.bincount(self.owner[:n], weights=self.expected_value, minlength=len(self._owner_names))
+        self.deals_by_week = np.bincount(self.week, weights=counts, minlength=self.n_weeks)
+        self.deals_by_stage = np.bincount(self.stage[:n], weights=counts, minlength=len(STAGES) + 1)
+
+    def _apply(self, i: int, sign: float) -> None:
+        """Add (+1) or remove (-1) deal ``i``'s contribution to the aggregates"""
+        if not self.active[i]:
+            return
+        expected = self.expected_value[i] * sign
+        self.by_week[self.week[i]] += expected
+        self.by_stage[self.stage[i]] += expected
+        self.by_owner[self.owner[i]] += expected
+        self.deals_by_week[self.week[i]] += sign
+        self.deals_by_stage[self.stage[i]] += sign
+
+    def _score(self, i: int) -> None:
+        """Recompute a single deal's probability, expected value and bucket"""
+        self.probability[i] = close_probabilities(self.stage[i:i + 1], self.days_in_pipeline[i:i + 1])[0]
+        self.expected_value[i] = self.value[i] * self.probability[i] if self.active[i] else 0.0
+        self.week[i] = STAGE_DAYS[self.stage[i]] // self.bucket_days
+
+    def _owner_code(self, owner: str) -> int:
+        code = self._owner_codes.get(owner)
+        if code is None:
+            code = len(self._owner_names)
+            self._owner_names.append(owner)
+            self._owner_codes[owner] = code
+            self.by_owner = np.append(self.by_owner, 0.0)
+        return code
+
+    def update_deal(self, deal_id: Hashable, stage: Optional[str] = None, value: Optional[float] = None,
+                    days_in_pipeline: Optional[float] = None, owner: Optional[str] = None) -> Dict[str, Any]:
+        """Apply a change to one deal and adjust aggregates in O(1)"""
+        i = self._index[deal_id]
+        self._apply(i, -1.0)
+
+        if stage is not None:
+            self.stage[i] = _stage_code(stage)
+        if value is not None:
+            self.value[i] = value
+        if days_in_pipeline is not None:
+            self.days_in_pipeline[i] = days_in_pipeline
+        if owner is not None:
+            self.owner[i] = self._owner_code(owner)
+
+        self._score(i)
+        self._apply(i, 1.0)
+        return self.deal(deal_id)
+
+    def remove_deal(self, deal_id: Hashable) -> None:
+        """Drop a closed or lost deal from the open pipeline"""
+        i = self._index[deal_id]
+        self._apply(i, -1.0)
+        self.active[i] = False
+        self.expected_value[i] = 0.0
+
+    def add_deal(self, deal_id: Hashable, stage: str, value: float,
+                 days_in_pipeline: float = 0, owner: str = 'unassigned') -> Dict[str, Any]:
+        """Append a new deal, growing the column buffers geometrically"""
+        if deal_id in self._index:
+            raise ValueError(f"Deal {deal_id!r} already exists")
+
+        i = self._size
+        capacity = max(16, 2 * i)
+        for name in ('stage', 'value', 'days_in_pipeline', 'owner', 'active',
+                     'probability', 'expected_value', 'week'):
+            column = getattr(self, name)
+            if i >= len(column):
+                grown = np.zeros(capacity, dtype=column.dtype)
+                grown[:i] = column[:i]
+                setattr(self, name, grown)
+
+        self._size += 1
+        self._index[deal_id] = i
+        self.stage[i] = _stage_code(stage)
+        self.value[i] = value
+        self.days_in_pipeline[i] = days_in_pipeline
+        self.owner[i] = self._owner_code(owner)
+        self.active[i] = True
+
+        self._score(i)
+        self._apply(i, 1.0)
+        return self.deal(deal_id)
+
+    def deal(self, deal_id: Hashable) -> Dict[str, Any]:
+        """Forecast for a single deal"""
+        i = self._index[deal_id]
+        stage = int(self.stage[i])
+        return {
+            'deal_id': deal_id,
+            'stage': STAGES[stage] if stage < len(STAGES) else 'unknown',
+            'owner': self._owner_names[self.owner[i]],
+            'close_probability': round(float(self.probability[i]), 2),
+            'estimated_days_to_close': int(STAGE_DAYS[stage]),
+            'forecast_value': round(float(self.expected_value[i]), 2),
+            'is_open': bool(self.active[i]),
+        }
+
+    def summary(self) -> Dict[str, Any]:
+        """Aggregated expected revenue by week, stage and owner"""
+        weeks = []
+        for week, (expected, deals) in enumerate(zip(self.by_week.tolist(), self.deals_by_week.tolist())):
+            weeks.append({
+                'week_start': (self.as_of + timedelta(days=week * self.bucket_days)).isoformat(),
+                'expected_value': round(expected, 2),
+                'deals': int(round(deals)),
+            })
+
+        stage_names = STAGES + ['unknown']
+        return {
+            'as_of': self.as_of.isoformat(),
+            'open_deals': int(self.active[:self._size].sum()),
+            'pipeline_value': round(float(self.value[:self._size][self.active[:self._size]].sum()), 2),
+            'expected_value': round(float(self.by_week.sum()), 2),
+            'by_week': weeks,
+            'by_stage': {
+                stage_names[code]: {'expected_value': round(expected, 2), 'deals': int(round(deals))}
+                for code, (expected, deals) in enumerate(zip(self.by_stage.tolist(), self.deals_by_stage.tolist()))
+                if deals
+            },
+            'by_owner': {
+                owner: round(expected, 2)
+                for owner, expected in zip(self._owner_names, self.by_owner.tolist())
+            },
+        }
+
+
+def forecast_pipeline(deals: Dict[str, Sequence[Any]], bucket_days: int = 7,
+                      as_of: Optional[date] = None) -> Dict[str, Any]:
+    """Forecast expected revenue for a columnar set of open deals"""
+    return PipelineForecaster(deals, as_of=as_of, bucket_days=bucket_days).summary()
@@ -0,0 +1,77 @@
+"""Import-time audit based on ``python -X importtime``
+
+Usage:
+    python -m backend.app.utils.import_audit backend.main
+"""
+
+import os
+import subprocess
+import sys
+from typing import Dict, List, Optional
+
+# Root-level modules that must not be imported while loading the API
+HEAVY_MODULES = ["numpy", "pandas", "sklearn", "scipy", "pymongo", "redis", "torch", "transformers"]
+
+# Budget for a cold ``import backend.main`` (cumulative microseconds)
+IMPORT_TIME_BUDGET_US = 2_000_000
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+
+def measure_import_time(module: str, python: Optional[str] = None) -> Dict[str, Dict[str, int]]:
+    """Import ``module`` in a fresh interpreter and return the per-module breakdown.
+
+    Returns a mapping of module name to ``{'self_us': ..., 'cumulative_us': ...}``.
+    """
+    result = subprocess.run(
+        [python or sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=PROJECT_ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return parse_importtime(result.stderr)
+
+
+def parse_importtime(output: str) -> Dict[str, Dict[str, int]]:
+    """Parse the stderr produced by ``-X importtime``"""
+    breakdown = {}
+    for line in output.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        parts = line[len("import time:"):].split("|")
+        if len(parts) != 3 or not parts[0].strip().isdigit():
+            continue  # header line
+        breakdown[parts[2].strip()] = {
+            'self_us': int(parts[0]),
+            'cumulative_us': int(parts[1]),
+        }
+    return breakdown
+
+
+def heavy_modules_loaded(breakdown: Dict[str, Dict[str, int]]) -> List[str]:
+    """Return the heavy root packages that appear in an import breakdown"""
+    roots = {name.split(".")[0] for name in breakdown}
+    return [module for module in HEAVY_MODULES if module in roots]
+
+
+def top_modules(breakdown: Dict[str, Dict[str, int]], n: int = 20) -> List[tuple]:
+    """Return the ``n`` modules with the largest self import time"""
+    ranked = sorted(breakdown.items(), key=lambda item: item[1]['self_us'], reverse=True)
+    return [(name, stats['self_us'], stats['cumulative_us']) for name, stats in ranked[:n]]
+
+
+if __name__ == "__main__":
+    target = sys.argv[1] if len(sys.argv) > 1 else "backend.main"
+    breakdown = measure_import_time(target)
+    total = breakdown.get(target, {}).get('cumulative_us', 0)
+
+    print(f"import {target}: {total / 1000:.1f} ms (budget {IMPORT_TIME_BUDGET_US / 1000:.0f} ms)")
+    print(f"{'module':<50} {'self ms':>10} {'cumul ms':>10}")
+    for name, self_us, cumulative_us in top_modules(breakdown):
+        print(f"{name:<50} {self_us / 1000:>10.1f} {cumulative_us / 1000:>10.1f}")
+
+    heavy = heavy_modules_loaded(breakdown)
+    if heavy:
+        print(f"Heavy modules loaded at import time: {', '.join(heavy)}")
+    sys.exit(1 if heavy or total > IMPORT_TIME_BUDGET_US else 0)
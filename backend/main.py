@@ -1,14 +1,22 @@
 """Main FastAPI Application"""
 
-from fastapi import FastAPI, Depends, HTTPException
+import asyncio
+import json
+from typing import List
+
+from fastapi import FastAPI, Depends, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 import uvicorn
 
 from backend.app.core.config import settings
+from backend.app.core.batching import MicroBatcher
+from backend.app.core.metrics import collect_metrics
 from backend.app.core.security import get_current_user, create_access_token, create_refresh_token, get_password_hash, verify_password
-from backend.app.db.database import Base, get_engine, get_db
+from backend.app.db.database import Base, get_engine, get_db, get_session_factory
 from backend.app.models.models import User
+from backend.app.services.finance.rollups import register_rollup_listeners
 from backend.app.schemas.schemas import (
     Token, UserCreate, UserResponse,
     ResumeCreate, ResumeResponse,
@@ -28,6 +36,31 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
+# Micro-batch wrappers keep service imports lazy
+def _screen_resumes_batch(resumes: list) -> list:
+    from backend.app.services.hr import screen_resumes
+    return screen_resumes(resumes)
+
+
+def _analyze_tickets_batch(tickets: list) -> list:
+    from backend.app.services.customer_support import analyze_support_tickets
+    return analyze_support_tickets(tickets)
+
+
+def _score_leads_batch(leads: list) -> list:
+    from backend.app.services.marketing import score_and_prioritize_leads
+    return score_and_prioritize_leads(leads)
+
+
+_batcher_options = dict(
+    max_batch_size=settings.MICROBATCH_MAX_BATCH_SIZE,
+    max_latency_ms=settings.MICROBATCH_MAX_LATENCY_MS,
+    enabled=settings.MICROBATCH_ENABLED
+)
+resume_batcher = MicroBatcher("hr.screen_resume", _screen_resumes_batch, **_batcher_options)
+ticket_batcher = MicroBatcher("support.analyze_ticket", _analyze_tickets_batch, **_batcher_options)
+lead_batcher = MicroBatcher("marketing.score_lead", _score_leads_batch, **_batcher_options)
+
 
 # Initialize FastAPI app
 app = FastAPI(
@@ -37,6 +70,10 @@ app = FastAPI(
 )
 
 
+# Keep transaction rollups current for every ORM insert
+register_rollup_listeners()
+
+
 @app.on_event("startup")
 def initialize_database() -> None:
     """Initialize database tables on startup."""
@@ -49,6 +86,36 @@ def initialize_database() -> None:
         logger.warning(f"Could not create database tables: {e}")
 
 
+@app.on_event("shutdown")
+def flush_correlated_alerts() -> None:
+    """Write still-open correlated alert groups before exiting."""
+    from backend.app.services.cybersecurity import correlation
+
+    if correlation._correlator is None:
+        return
+    try:
+        db = get_session_factory()()
+        try:
+            correlation.write_aggregates(db, correlation._correlator.flush_all())
+        finally:
+            db.close()
+    except Exception as e:
+        logger.warning(f"Could not flush correlated alerts: {e}")
+
+
+@app.on_event("shutdown")
+def persist_metric_baselines() -> None:
+    """Snapshot rolling metric baselines so restarts keep them."""
+    from backend.app.ml.baselines import save_baseline_snapshot
+
+    try:
+        path = save_baseline_snapshot()
+        if path:
+            logger.info(f"Metric baselines saved to {path}")
+    except OSError as e:
+        logger.warning(f"Could not save metric baselines: {e}")
+
+
 # CORS middleware
 app.add_middleware(
     CORSMiddleware,
@@ -76,6 +143,12 @@ async def health_check():
     return {"status": "healthy"}
 
 
+@app.get("/api/v1/system/metrics")
+async def system_metrics(current_user: dict = Depends(get_current_user)):
+    """In-process runtime metrics (micro-batching, etc.)"""
+    return collect_metrics()
+
+
 # Authentication endpoints
 @app.post("/api/v1/auth/register", response_model=UserResponse)
 async def register(user: UserCreate, db: Session = Depends(get_db)):
@@ -123,9 +196,11 @@ async def login(email: str, password: str, db: Session = Depends(get_db)):
 @app.post("/api/v1/hr/resume/screen")
 async def screen_resume_endpoint(resume: ResumeCreate, current_user: dict = Depends(get_current_user)):
     """Screen a resume"""
-    from backend.app.services.hr import screen_resume
-
-    result = screen_resume(resume.resume_text, resume.candidate_name, resume.email)
+    result = await resume_batcher.submit({
+        'resume_text': resume.resume_text,
+        'candidate_name': resume.candidate_name,
+        'email': resume.email
+    })
     return result
 
 
@@ -163,13 +238,62 @@ async def forecast_revenue(historical_data: list, current_user: dict = Depends(g
     return result
 
 
+@app.post("/api/v1/finance/revenue/forecast/batch")
+async def forecast_revenue_batch(series: dict, horizon: int = 3, method: str = "holt", level: float = 0.95,
+                                 season_length: int = 12, current_user: dict = Depends(get_current_user)):
+    """Forecast many named revenue series at once with prediction intervals"""
+    from backend.app.services.finance.forecasting_engine import forecast_revenue_series
+
+    try:
+        result = forecast_revenue_series(series, horizon=horizon, method=method, level=level, season_length=season_length)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return result
+
+
+@app.get("/api/v1/finance/series/{series_id}")
+async def get_finance_series(series_id: str, current_user: dict = Depends(get_current_user), db: Session = Depends(get_db)):
+    """Revenue/expense series for a slice, served from the rollup table"""
+    from backend.app.services.finance import get_series
+
+    try:
+        result = get_series(db, series_id)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return result
+
+
+@app.get("/api/v1/finance/forecast/{series_id}")
+async def forecast_finance_series(series_id: str, horizon: int = 3, method: str = "holt", level: float = 0.95,
+                                  current_user: dict = Depends(get_current_user), db: Session = Depends(get_db)):
+    """Forecast a rollup-backed series by ID (e.g. month:income:technology)"""
+    from backend.app.services.finance import forecast_series
+
+    try:
+        result = forecast_series(db, series_id, horizon=horizon, method=method, level=level)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return result
+
+
+@app.post("/api/v1/finance/rollups/rebuild")
+async def rebuild_finance_rollups(current_user: dict = Depends(get_current_user), db: Session = Depends(get_db)):
+    """Recompute transaction rollups from the raw transactions table"""
+    from backend.app.services.finance import rebuild_rollups
+
+    result = rebuild_rollups(db)
+    return result
+
+
 # Customer Support endpoints
 @app.post("/api/v1/support/ticket/analyze")
 async def analyze_ticket(ticket: TicketCreate, current_user: dict = Depends(get_current_user)):
     """Analyze support ticket"""
-    from backend.app.services.customer_support import analyze_support_ticket
-
-    result = analyze_support_ticket(ticket.subject, ticket.description, ticket.customer_email)
+    result = await ticket_batcher.submit({
+        'subject': ticket.subject,
+        'description': ticket.description,
+        'customer_email': ticket.customer_email
+    })
     return result
 
 
@@ -192,9 +316,7 @@ async def score_lead(lead: LeadCreate, current_user: dict = Depends(get_current_
         'company': lead.company,
         'source': lead.source
     }
-    from backend.app.services.marketing import score_and_prioritize_lead
-
-    result = score_and_prioritize_lead(lead_data)
+    result = await lead_batcher.submit(lead_data)
     return result
 
 
@@ -218,6 +340,15 @@ async def customer_health(customer_data: dict, current_user: dict = Depends(get_
     return result
 
 
+@app.post("/api/v1/sales/customers/rescore")
+async def rescore_customers_endpoint(chunk_size: int = 50_000, current_user: dict = Depends(get_current_user), db: Session = Depends(get_db)):
+    """Recompute churn risk and lifetime value for all customers"""
+    from backend.app.services.sales import rescore_customers
+
+    result = rescore_customers(db, chunk_size=chunk_size)
+    return result
+
+
 @app.post("/api/v1/sales/deal/forecast")
 async def forecast_deal(deal_data: dict, current_user: dict = Depends(get_current_user)):
     """Forecast deal closure"""
@@ -228,6 +359,18 @@ async def forecast_deal(deal_data: dict, current_user: dict = Depends(get_curren
     return result
 
 
+@app.post("/api/v1/sales/pipeline/forecast")
+async def forecast_pipeline_endpoint(deals: dict, bucket_days: int = 7, current_user: dict = Depends(get_current_user)):
+    """Forecast expected revenue by week, stage and owner for a columnar deal set"""
+    from backend.app.services.sales import forecast_pipeline
+
+    try:
+        result = forecast_pipeline(deals, bucket_days=bucket_days)
+    except (ValueError, KeyError) as e:
+        raise HTTPException(status_code=400, detail=f"Invalid deal columns: {e}")
+    return result
+
+
 # Cybersecurity endpoints
 @app.post("/api/v1/security/alert/analyze")
 async def analyze_alert(alert: SecurityAlertCreate, current_user: dict = Depends(get_current_user)):
@@ -245,6 +388,173 @@ async def analyze_alert(alert: SecurityAlertCreate, current_user: dict = Depends
     return result
 
 
+_alert_flusher = None
+
+
+def _write_expired_alert_groups() -> int:
+    from backend.app.services.cybersecurity import get_alert_correlator, write_aggregates
+
+    aggregates = get_alert_correlator().flush_expired()
+    if not aggregates:
+        return 0
+    db = get_session_factory()()
+    try:
+        return write_aggregates(db, aggregates)
+    finally:
+        db.close()
+
+
+async def _flush_alert_groups_periodically() -> None:
+    """Close correlation windows on time even when no new alerts arrive"""
+    from starlette.concurrency import run_in_threadpool
+
+    interval = max(0.5, settings.ALERT_CORRELATION_WINDOW_SECONDS / 4)
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            await run_in_threadpool(_write_expired_alert_groups)
+        except Exception as e:
+            logger.warning(f"Correlated alert flush failed: {e}")
+
+
+@app.post("/api/v1/security/alerts/ingest")
+async def ingest_security_alerts(alerts: List[SecurityAlertCreate], current_user: dict = Depends(get_current_user),
+                                 db: Session = Depends(get_db)):
+    """Analyze and correlate raw alerts; only aggregated groups are written to security_alerts"""
+    global _alert_flusher
+    from backend.app.services.cybersecurity import analyze_security_alert, get_alert_correlator, write_aggregates
+
+    if _alert_flusher is None or _alert_flusher.done():
+        _alert_flusher = asyncio.create_task(_flush_alert_groups_periodically())
+
+    correlator = get_alert_correlator()
+    closed = []
+    for alert in alerts:
+        analysis = analyze_security_alert({
+            'type': alert.alert_type,
+            'severity': alert.severity,
+            'source_ip': alert.source_ip,
+            'destination_ip': alert.destination_ip,
+            'description': alert.description
+        })
+        closed.extend(correlator.add({
+            'alert_type': alert.alert_type,
+            'severity': analysis.get('severity', alert.severity),
+            'source_ip': alert.source_ip,
+            'destination_ip': alert.destination_ip,
+            'description': alert.description,
+            'is_threat': analysis['is_threat'],
+            'threat_score': analysis['threat_score'],
+        }))
+    closed.extend(correlator.flush_expired())
+    written = write_aggregates(db, closed)
+
+    return {"alerts_received": len(alerts), "aggregates_written": written, "correlation": correlator.stats()}
+
+
+@app.post("/api/v1/security/compliance/scan")
+async def scan_compliance(configs: dict, prune: bool = False, include_results: bool = False, n_jobs: int = 1,
+                          current_user: dict = Depends(get_current_user)):
+    """Scan {config_id: config} against security policies; unchanged configs are not re-evaluated"""
+    from starlette.concurrency import run_in_threadpool
+    from backend.app.services.cybersecurity import get_compliance_scanner
+
+    if not all(isinstance(config, dict) for config in configs.values()):
+        raise HTTPException(status_code=400, detail="Each config must be an object of policy fields")
+    return await run_in_threadpool(get_compliance_scanner().scan, configs, prune=prune,
+                                   include_results=include_results, n_jobs=n_jobs)
+
+
+@app.post("/api/v1/security/anomaly/detect")
+async def detect_security_anomaly(metrics: dict, current_user: dict = Depends(get_current_user)):
+    """Score security metrics against their learned rolling baselines"""
+    from backend.app.services.cybersecurity import AnomalyDetector
+
+    try:
+        result = AnomalyDetector.detect_with_baselines(metrics, prefix="security")
+    except (TypeError, ValueError) as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return result
+
+
+@app.post("/api/v1/security/ip-index/reload")
+async def reload_ip_index(current_user: dict = Depends(get_current_user)):
+    """Reload internal-range and blocklist files; lookups keep using the old index until the swap"""
+    from starlette.concurrency import run_in_threadpool
+    from backend.app.services.cybersecurity import get_ip_classifier
+
+    try:
+        return await run_in_threadpool(get_ip_classifier().reload)
+    except OSError as e:
+        raise HTTPException(status_code=400, detail=f"Could not load IP range files: {e}")
+
+
+# Metric baselines (security metrics and business KPIs)
+@app.post("/api/v1/baselines/observe")
+async def observe_metrics(observations: List[dict], current_user: dict = Depends(get_current_user)):
+    """Score a batch of {key, value} observations against rolling baselines, then learn from them"""
+    from backend.app.ml.baselines import get_baseline_engine
+
+    try:
+        result = get_baseline_engine().observe(observations)
+    except (KeyError, TypeError, ValueError) as e:
+        raise HTTPException(status_code=400, detail=f"Invalid observations: {e}")
+    return result
+
+
+@app.get("/api/v1/baselines/{key}")
+async def get_metric_baseline(key: str, current_user: dict = Depends(get_current_user)):
+    """Current rolling baseline for a metric key"""
+    from backend.app.ml.baselines import get_baseline_engine
+
+    baseline = get_baseline_engine().baseline(key)
+    if baseline is None:
+        raise HTTPException(status_code=404, detail=f"No baseline for metric {key!r}")
+    return baseline
+
+
+@app.post("/api/v1/baselines/snapshot")
+async def snapshot_metric_baselines(current_user: dict = Depends(get_current_user)):
+    """Persist metric baselines now (also done on shutdown)"""
+    from backend.app.ml.baselines import get_baseline_engine, save_baseline_snapshot
+
+    get_baseline_engine()
+    return {"path": save_baseline_snapshot(), **get_baseline_engine().stats()}
+
+
+# Unified batch inference
+@app.post("/api/v1/batch/{service}")
+async def batch_inference(service: str, request: Request, chunk_size: int = 500,
+                          current_user: dict = Depends(get_current_user)):
+    """Run a service over a JSON array or NDJSON body, streaming NDJSON results in input order"""
+    from backend.app.core.streaming import aiter_ndjson, is_ndjson
+    from backend.app.services.batch_registry import BATCH_SERVICES, get_batch_service, stream_batch
+
+    try:
+        batch_service = get_batch_service(service)
+    except KeyError:
+        raise HTTPException(status_code=404, detail=f"Unknown batch service {service!r}; available: {sorted(BATCH_SERVICES)}")
+
+    if is_ndjson(request.headers.get('content-type', '')):
+        records = aiter_ndjson(request.stream())
+    else:
+        try:
+            body = json.loads(await request.body())
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=f"Invalid JSON body: {e}")
+        if not isinstance(body, list):
+            raise HTTPException(status_code=400, detail="Body must be a JSON array or NDJSON")
+
+        async def records_from_list():
+            for record in body:
+                yield record
+
+        records = records_from_list()
+
+    return StreamingResponse(stream_batch(batch_service, records, chunk_size=chunk_size),
+                             media_type="application/x-ndjson")
+
+
 # Dashboard endpoint
 @app.get("/api/v1/dashboard/metrics", response_model=DashboardMetrics)
 async def get_dashboard_metrics(current_user: dict = Depends(get_current_user), db: Session = Depends(get_db)):
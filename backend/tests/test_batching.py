@@ -0,0 +1,100 @@
+"""Test micro-batching"""
+
+import asyncio
+import pytest
+from backend.app.core.batching import MicroBatcher
+
+
+def test_concurrent_requests_share_one_batch():
+    """Concurrent submissions are coalesced and results fan back in order"""
+    calls = []
+
+    def double(items):
+        calls.append(list(items))
+        return [item * 2 for item in items]
+
+    batcher = MicroBatcher("test.double", double, max_batch_size=8, max_latency_ms=5)
+
+    async def run():
+        return await asyncio.gather(*(batcher.submit(i) for i in range(5)))
+
+    results = asyncio.run(run())
+
+    assert results == [0, 2, 4, 6, 8]
+    assert calls == [[0, 1, 2, 3, 4]]
+    stats = batcher.stats()
+    assert stats['batches'] == 1
+    assert stats['avg_batch_size'] == 5
+
+
+def test_batch_size_limit_flushes_early():
+    """A full batch is dispatched without waiting for the latency window"""
+    sizes = []
+
+    def identity(items):
+        sizes.append(len(items))
+        return items
+
+    batcher = MicroBatcher("test.identity", identity, max_batch_size=4, max_latency_ms=1000)
+
+    async def run():
+        return await asyncio.gather(*(batcher.submit(i) for i in range(10)))
+
+    assert asyncio.run(run()) == list(range(10))
+    assert sizes == [4, 4, 2]
+    assert batcher.stats()['flush_reasons']['size'] == 2
+
+
+def test_batch_errors_propagate_to_every_caller():
+    """A failing batch raises in each awaiting request"""
+    def fail(items):
+        raise ValueError("boom")
+
+    batcher = MicroBatcher("test.fail", fail, max_batch_size=4, max_latency_ms=1)
+
+    async def run():
+        return await asyncio.gather(*(batcher.submit(i) for i in range(3)), return_exceptions=True)
+
+    results = asyncio.run(run())
+    assert all(isinstance(r, ValueError) for r in results)
+    assert batcher.stats()['errors'] == 1
+
+
+def test_batch_endpoint_streams_results_in_order(client, auth_headers):
+    """A JSON array is validated per record and answered line by line in input order"""
+    import json
+
+    leads = [
+        {"name": "Ada", "email": "ada@example.com", "company": "Acme", "source": "referral"},
+        {"name": "Bob", "email": "not-an-email", "source": "web"},
+        {"name": "Cy", "email": "cy@example.com", "source": "event"},
+    ]
+    response = client.post("/api/v1/batch/marketing.score_lead?chunk_size=2", json=leads, headers=auth_headers)
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    assert [line["index"] for line in lines] == [0, 1, 2]
+    assert "lead_score" in lines[0]["result"] and "lead_score" in lines[2]["result"]
+    assert lines[1]["error"][0]["loc"] == ["email"]
+
+
+def test_batch_endpoint_accepts_ndjson(client, auth_headers):
+    """NDJSON bodies are parsed incrementally; malformed lines are reported in place"""
+    import json
+
+    body = "\n".join([
+        json.dumps({"transaction_type": "expense", "amount": 120.5,
+                    "description": "Office supplies", "date": "2024-01-05T00:00:00"}),
+        "{not json",
+        json.dumps({"customer_id": 7, "days_since_last_activity": 90, "support_tickets": 4}),
+    ]) + "\n"
+    response = client.post("/api/v1/batch/finance.analyze_transaction", content=body,
+                           headers={**auth_headers, "Content-Type": "application/x-ndjson"})
+
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    assert lines[0]["result"]["category"]
+    assert lines[1]["error"].startswith("Invalid JSON")
+    assert "error" in lines[2]
+
+    assert client.post("/api/v1/batch/nope", json=[], headers=auth_headers).status_code == 404
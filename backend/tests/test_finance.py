@@ -30,3 +30,74 @@ def test_forecast_revenue():
     assert "forecasts" in result
     assert len(result["forecasts"]) == 3
     assert all(isinstance(f, (int, float)) for f in result["forecasts"])
+
+
+def test_multi_series_forecast_recovers_linear_trend():
+    """Linear trend fits each row exactly and intervals bracket the forecast"""
+    import numpy as np
+    from backend.app.services.finance.forecasting_engine import MultiSeriesForecaster
+
+    t = np.arange(12)
+    Y = np.vstack([2 * t + 1, -t + 50, np.full(12, 7.0)])
+
+    result = MultiSeriesForecaster(method='linear').forecast(Y, horizon=2)
+
+    np.testing.assert_allclose(result['forecast'], [[25, 27], [38, 37], [7, 7]])
+    assert (result['lower'] <= result['forecast']).all()
+    assert (result['upper'] >= result['forecast']).all()
+
+
+@pytest.mark.parametrize("method", ["linear", "holt", "seasonal_naive"])
+def test_forecast_revenue_series_methods(method):
+    """Every method returns widening intervals for each named series"""
+    from backend.app.services.finance.forecasting_engine import forecast_revenue_series
+
+    series = {
+        "sales": [10, 12, 11, 13, 12, 14, 13, 15, 14, 16, 15, 17, 16, 18],
+        "support": [5, 5.5, 5.2, 5.8, 5.6, 6.1, 5.9, 6.4, 6.2, 6.6, 6.5, 7.0, 6.8, 7.2],
+        "short": [1.0, 1.5, 1.7, 2.1, 2.0, 2.6, 2.9, 3.1, 3.0, 3.4, 3.8, 3.9, 4.1],
+    }
+
+    result = forecast_revenue_series(series, horizon=4, method=method, season_length=4)
+
+    assert result["series_count"] == 3
+    for forecast in result["forecasts"].values():
+        widths = [u - l for l, u in zip(forecast["lower"], forecast["upper"])]
+        assert len(forecast["forecast"]) == 4
+        assert widths[-1] >= widths[0] > 0
+
+
+def test_rollups_update_on_insert_and_serve_forecasts(db_session, client, auth_headers):
+    """ORM inserts maintain rollups that back series and forecasts by ID"""
+    from datetime import datetime
+    from backend.app.models.models import Transaction, TransactionRollup
+    from backend.app.services.finance import get_series, rebuild_rollups
+
+    for month in range(1, 7):
+        for i, category in enumerate(["technology", "travel"]):
+            db_session.add(Transaction(
+                transaction_id=f"T{month}-{i}",
+                transaction_type="income",
+                category=category,
+                amount=1000.0 * month + i,
+                date=datetime(2024, month, 10)
+            ))
+    db_session.commit()
+
+    series = get_series(db_session, "month:income")
+    assert [p["total_amount"] for p in series["points"]] == [2001.0 * m + 1 - m for m in range(1, 7)]
+    assert get_series(db_session, "month:income:travel")["points"][0]["total_amount"] == 1001.0
+
+    incremental = {(r.period, r.period_start, r.category): r.total_amount
+                   for r in db_session.query(TransactionRollup).all()}
+    rebuild_rollups(db_session)
+    rebuilt = {(r.period, r.period_start, r.category): r.total_amount
+               for r in db_session.query(TransactionRollup).all()}
+    assert rebuilt == incremental
+
+    response = client.get("/api/v1/finance/forecast/month:income?horizon=2&method=linear", headers=auth_headers)
+    assert response.status_code == 200
+    forecast = response.json()["forecast"]
+    assert [f["period_start"] for f in forecast] == ["2024-07-01", "2024-08-01"]
+    assert forecast[0]["forecast"] == pytest.approx(14001.0)
+    assert forecast[0]["lower"] <= forecast[0]["forecast"] <= forecast[0]["upper"]
@@ -0,0 +1,28 @@
+"""Test import-time budget"""
+
+import pytest
+from backend.app.utils.import_audit import (
+    IMPORT_TIME_BUDGET_US,
+    heavy_modules_loaded,
+    measure_import_time,
+)
+
+
+def test_main_import_avoids_heavy_modules():
+    """Importing the API must not load ML or database client libraries"""
+    breakdown = measure_import_time("backend.main")
+
+    assert heavy_modules_loaded(breakdown) == []
+    assert breakdown["backend.main"]["cumulative_us"] < IMPORT_TIME_BUDGET_US
+
+
+@pytest.mark.parametrize("module", [
+    "backend.app.services.hr",
+    "backend.app.services.finance",
+    "backend.app.db.database",
+])
+def test_service_import_is_lazy(module):
+    """Service and database modules defer sklearn, numpy, pymongo and redis"""
+    breakdown = measure_import_time(module)
+
+    assert heavy_modules_loaded(breakdown) == []
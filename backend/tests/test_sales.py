@@ -0,0 +1,103 @@
+"""Test Sales services"""
+
+import pytest
+from datetime import datetime, timedelta
+from backend.app.models.models import Customer
+from backend.app.services.sales import (
+    ChurnPredictionModel,
+    CustomerLifetimeValueModel,
+    DealForecasting,
+    PipelineForecaster,
+    rescore_customers
+)
+
+
+def test_rescore_customers_matches_single_record_models(db_session):
+    """Batch rescoring writes the same scores as the per-customer models"""
+    as_of = datetime(2024, 6, 1)
+    profiles = [
+        dict(days=120, support_ticket_count=7, payment_failures=1, engagement_score=10,
+             avg_purchase_value=200.0, purchase_frequency=4.0, customer_lifespan_months=36.0),
+        dict(days=45, support_ticket_count=0, payment_failures=0, engagement_score=80,
+             avg_purchase_value=5000.0, purchase_frequency=6.0, customer_lifespan_months=None),
+        dict(days=None, support_ticket_count=None, payment_failures=None, engagement_score=None,
+             avg_purchase_value=None, purchase_frequency=None, customer_lifespan_months=None),
+    ]
+    for i, profile in enumerate(profiles):
+        days = profile.pop('days')
+        db_session.add(Customer(
+            customer_id=f"CUST{i}",
+            email=f"c{i}@example.com",
+            last_activity_at=as_of - timedelta(days=days) if days is not None else None,
+            **profile
+        ))
+    db_session.commit()
+
+    result = rescore_customers(db_session, chunk_size=2, as_of=as_of)
+
+    assert result['customers_scored'] == 3
+    assert result['chunks'] == 2
+
+    customers = db_session.query(Customer).order_by(Customer.id).all()
+    assert [c.churn_risk for c in customers] == [1.0, 0.2, 0.0]
+    assert customers[0].churn_risk == ChurnPredictionModel.predict_churn({
+        'days_since_last_activity': 120, 'support_tickets': 7,
+        'payment_failures': 1, 'engagement_score': 10
+    })['churn_risk']
+    assert customers[1].lifetime_value == CustomerLifetimeValueModel.calculate_clv({
+        'avg_purchase_value': 5000, 'purchase_frequency': 6
+    })
+    assert customers[2].lifetime_value == 0.0
+
+
+def test_rescore_endpoint(client, auth_headers):
+    """Rescore trigger runs over an empty table"""
+    response = client.post("/api/v1/sales/customers/rescore", headers=auth_headers)
+
+    assert response.status_code == 200
+    assert response.json()["customers_scored"] == 0
+
+
+def test_pipeline_forecast_matches_single_deal_forecast():
+    """Vectorized pipeline probabilities agree with DealForecasting"""
+    deals = {
+        'deal_id': ['D1', 'D2', 'D3', 'D4'],
+        'stage': ['proposal', 'closing', 'initial', 'mystery'],
+        'value': [50000, 12000, 80000, 1000],
+        'days_in_pipeline': [30, 120, 3, 10],
+        'owner': ['alice', 'bob', 'alice', 'bob'],
+    }
+    forecaster = PipelineForecaster(deals)
+
+    for i, deal_id in enumerate(deals['deal_id']):
+        expected = DealForecasting.forecast_deal({
+            'stage': deals['stage'][i],
+            'value': deals['value'][i],
+            'days_in_pipeline': deals['days_in_pipeline'][i],
+        })
+        assert forecaster.deal(deal_id)['forecast_value'] == expected['forecast_value']
+
+    summary = forecaster.summary()
+    assert summary['open_deals'] == 4
+    assert summary['by_owner']['alice'] == pytest.approx(25000 + 7200)
+
+
+def test_pipeline_incremental_update_matches_recompute():
+    """Moving, adding and closing deals keeps aggregates consistent"""
+    forecaster = PipelineForecaster({
+        'deal_id': [1, 2, 3],
+        'stage': ['initial', 'qualified', 'proposal'],
+        'value': [1000, 2000, 3000],
+        'days_in_pipeline': [10, 20, 30],
+        'owner': ['a', 'b', 'a'],
+    })
+
+    forecaster.update_deal(1, stage='negotiation')
+    forecaster.add_deal(4, stage='closing', value=500, days_in_pipeline=40, owner='c')
+    forecaster.remove_deal(2)
+    incremental = forecaster.summary()
+
+    forecaster.recompute()
+    assert forecaster.summary() == incremental
+    assert incremental['open_deals'] == 3
+    assert incremental['by_owner']['b'] == 0
@@ -0,0 +1,202 @@
+"""Test Cybersecurity services"""
+
+import io
+import json
+import pytest
+from backend.app.models.models import SecurityAlert
+from backend.app.services.cybersecurity import IntrusionDetectionSystem, IPClassifier, IPRangeIndex
+from backend.app.services.cybersecurity import security_service
+from backend.app.services.cybersecurity.flow_stream import (
+    FlowStreamIDS,
+    read_ndjson,
+    read_zeek,
+    run_flow_ids
+)
+
+# 2024-06-01 03:00:00 UTC (off-hours) and 12:00:00 UTC
+NIGHT = 1717210800
+NOON = 1717243200
+
+
+def test_network_traffic_uses_event_timestamp():
+    """Off-hours detection follows the event time, not the wall clock"""
+    flow = {'source_ip': '203.0.113.9', 'bytes': 2_000_000, 'port': 443}
+
+    night = IntrusionDetectionSystem.analyze_network_traffic({**flow, 'timestamp': NIGHT})
+    noon = IntrusionDetectionSystem.analyze_network_traffic({**flow, 'timestamp': '2024-06-01T12:00:00Z'})
+
+    assert 'Off-hours activity' in night['detected_threats']
+    assert 'Off-hours activity' not in noon['detected_threats']
+    assert night['threat_score'] == 0.65
+    assert noon['threat_score'] == 0.5
+
+
+def test_streaming_ids_detects_port_scan_and_writes_alerts(db_session):
+    """A source touching many ports inside the window raises one bulk-written alert"""
+    scan = [{'timestamp': NOON + i * 0.1, 'source_ip': '10.0.0.66', 'destination_ip': '10.0.0.1',
+             'port': 1000 + i, 'bytes': 60} for i in range(40)]
+    normal = [{'timestamp': NOON + i, 'source_ip': '10.0.0.5', 'destination_ip': '10.0.0.1',
+               'port': 443, 'bytes': 1200} for i in range(40)]
+    stream = io.StringIO(''.join(json.dumps(r) + '\n' for r in scan + normal))
+
+    summary = run_flow_ids(read_ndjson(stream), db_session, chunk_size=32)
+
+    assert summary['flows_processed'] == 80
+    alerts = db_session.query(SecurityAlert).all()
+    assert {a.source_ip for a in alerts} == {'10.0.0.66'}
+    assert 'port scan' in alerts[0].description
+
+
+def test_streaming_ids_matches_single_flow_rules():
+    """Without window rules firing, chunk scores equal the per-flow analyzer"""
+    flows = [
+        {'timestamp': NIGHT, 'source_ip': '203.0.113.9', 'destination_ip': '10.0.0.1', 'port': 22, 'bytes': 2_000_000},
+        {'timestamp': NOON, 'source_ip': '192.168.1.4', 'destination_ip': '10.0.0.1', 'port': 80, 'bytes': 10},
+    ]
+    ids = FlowStreamIDS()
+    from backend.app.services.cybersecurity.flow_stream import to_columns
+
+    scores = ids.score_chunk(to_columns(flows))['score']
+
+    for flow, score in zip(flows, scores):
+        assert round(float(score), 2) == IntrusionDetectionSystem.analyze_network_traffic(flow)['threat_score']
+
+
+def test_read_zeek_conn_log():
+    """Zeek TSV logs map to normalized flow fields"""
+    log = io.StringIO(
+        "#separator \\x09\n"
+        "#fields\tts\tuid\tid.orig_h\tid.orig_p\tid.resp_h\tid.resp_p\tproto\torig_bytes\tresp_bytes\n"
+        "1717243200.5\tC1\t203.0.113.9\t51515\t10.0.0.1\t3389\ttcp\t100\t-\n"
+    )
+
+    flows = list(read_zeek(log))
+
+    assert flows == [{'timestamp': '1717243200.5', 'source_ip': '203.0.113.9',
+                      'destination_ip': '10.0.0.1', 'port': '3389', 'bytes': 100}]
+
+
+def test_ip_range_index_most_specific_match():
+    """Nested CIDRs resolve to the most specific label across IPv4 and IPv6"""
+    index = IPRangeIndex([
+        ('10.0.0.0/8', 'corp'), ('10.1.0.0/16', 'lab'), ('10.1.2.3', 'host'),
+        ('2001:db8::/32', 'docs'), ('not-an-ip', 'x'),
+    ])
+
+    assert index.lookup('10.9.9.9') == 'corp'
+    assert index.lookup('10.1.200.1') == 'lab'
+    assert index.lookup('10.1.2.3') == 'host'
+    assert index.lookup('10.1.2.4') == 'lab'
+    assert index.lookup('11.0.0.1') is None
+    assert index.lookup('2001:db8:ffff::1') == 'docs'
+    assert index.lookup('::ffff:10.1.2.3') == 'host'
+    assert index.lookup('garbage') is None
+    assert index.stats()['skipped'] == 1
+
+
+def test_ip_classifier_reload_feeds_ids(tmp_path, monkeypatch):
+    """Internal ranges cover 172.16/12 and IPv6; reloaded blocklists raise IDS scores"""
+    blocklist = tmp_path / 'blocklist.txt'
+    blocklist.write_text("# threat feed\n198.51.100.0/24 botnet\n")
+    classifier = IPClassifier(blocklist_paths=[str(blocklist)])
+    monkeypatch.setattr(security_service, 'get_ip_classifier', lambda: classifier)
+
+    assert IntrusionDetectionSystem.is_internal_ip('172.20.1.1')
+    assert IntrusionDetectionSystem.is_internal_ip('fd00::1')
+    assert not IntrusionDetectionSystem.is_internal_ip('172.32.0.1')
+
+    flow = {'source_ip': '198.51.100.7', 'bytes': 10, 'port': 443, 'timestamp': NOON}
+    assert IntrusionDetectionSystem.analyze_network_traffic(flow)['threat_score'] == 0.2
+
+    classifier.reload()
+    result = IntrusionDetectionSystem.analyze_network_traffic(flow)
+    assert result['threat_score'] == 0.7
+    assert 'Source IP on blocklist (botnet)' in result['detected_threats']
+    assert security_service.analyze_security_alert(
+        {'type': 'malware', 'severity': 'low', 'source_ip': '198.51.100.7'}
+    )['blocklist_match'] == 'botnet'
+
+
+def test_baseline_engine_batches_match_sequential_and_persist(tmp_path):
+    """Batched ingest equals one-at-a-time ingest; snapshots round-trip"""
+    import numpy as np
+    from backend.app.ml.baselines import BaselineEngine
+
+    rng = np.random.default_rng(7)
+    keys = [f"kpi.metric_{i}" for i in rng.integers(0, 5, 300)]
+    values = rng.normal(100, 5, 300)
+
+    batched, sequential = BaselineEngine(), BaselineEngine()
+    result = batched.ingest(keys, values)
+    z_sequential = [sequential.ingest([k], [v])['z_score'][0] for k, v in zip(keys, values)]
+
+    assert np.allclose(result['z_score'], z_sequential)
+    assert batched.baseline('kpi.metric_0') == sequential.baseline('kpi.metric_0')
+    assert not batched.ingest(['kpi.metric_0'], [101.0])['anomalous'][0]
+    assert batched.ingest(['kpi.metric_0'], [180.0])['anomalous'][0]
+
+    path = str(tmp_path / 'baselines.npz')
+    batched.save(path)
+    restored = BaselineEngine.load(path)
+    assert restored.baseline('kpi.metric_3') == batched.baseline('kpi.metric_3')
+
+
+def test_alert_correlator_folds_floods_and_caps_memory(db_session):
+    """Duplicate alerts collapse into one row per window; the group cap closes the oldest early"""
+    from backend.app.services.cybersecurity import AlertCorrelator, write_aggregates
+
+    correlator = AlertCorrelator(window_seconds=60, max_groups=2)
+    flood = {'alert_type': 'intrusion', 'source_ip': '203.0.113.9', 'destination_ip': '10.0.0.1',
+             'severity': 'medium', 'threat_score': 0.5, 'is_threat': True, 'description': 'Failed login'}
+    closed = []
+    for i in range(1000):
+        closed += correlator.add({**flood, 'severity': 'critical' if i == 500 else 'medium'}, now=NOON + i * 0.01)
+    assert closed == [] and correlator.stats()['open_groups'] == 1
+
+    closed += correlator.add({**flood, 'source_ip': '198.51.100.1'}, now=NOON + 20)
+    closed += correlator.add({**flood, 'source_ip': '198.51.100.2'}, now=NOON + 21)
+    assert len(closed) == 1 and correlator.stats()['early_flushes'] == 1
+
+    closed += correlator.flush_expired(now=NOON + 80.5)
+    assert [g['source_ip'] for g in closed] == ['203.0.113.9', '198.51.100.1']
+    write_aggregates(db_session, closed)
+
+    row = db_session.query(SecurityAlert).filter(SecurityAlert.source_ip == '203.0.113.9').one()
+    assert row.occurrence_count == 1000
+    assert row.severity == 'critical'
+    assert (row.last_seen - row.first_seen).total_seconds() == pytest.approx(9.99)
+    assert correlator.stats()['open_groups'] == 1
+
+
+def test_compliance_scanner_matches_single_checks_and_rescans_incrementally():
+    """Vectorized scan agrees with check_compliance and skips unchanged configs"""
+    from backend.app.services.cybersecurity import ComplianceMonitor, ComplianceScanner
+
+    configs = {
+        'web-01': {'password_min_length': 14, 'mfa_enabled': True, 'encryption_at_rest': True,
+                   'days_since_access_review': 30},
+        'db-07': {'password_min_length': 8, 'mfa_enabled': False, 'encryption_at_rest': True,
+                  'days_since_access_review': 120},
+        'legacy': {'hostname': 'legacy'},
+    }
+    scanner = ComplianceScanner()
+
+    summary = scanner.scan(configs, include_results=True)
+
+    results = {r['config_id']: r for r in summary['results']}
+    for config_id, config in configs.items():
+        expected = ComplianceMonitor.check_compliance(config)
+        if expected['is_compliant']:
+            assert config_id not in results
+        else:
+            assert {key: results[config_id][key] for key in expected} == expected
+    assert summary['violations_by_rule'] == {'password_strength': 2, 'mfa_required': 2,
+                                             'encryption_required': 1, 'access_review_days': 1}
+
+    configs['db-07'] = {**configs['db-07'], 'mfa_enabled': True, 'owner': 'dba-team'}
+    configs['legacy'] = {**configs['legacy'], 'owner': 'ops'}
+    rescan = scanner.scan(configs)
+
+    assert rescan['configs_rescanned'] == 1
+    assert rescan['violations_by_rule']['mfa_required'] == 1
+    assert scanner.result('db-07')['violated_rules'] == ['password_strength', 'access_review_days']